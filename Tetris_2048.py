@@ -1,190 +1,403 @@
-import lib.stddraw as stddraw
-from lib.picture import Picture
-from lib.color import Color
-import os
-from game_grid import GameGrid
-from point import Point
-from tetromino import Tetromino
-from game_grid import draw_tetromino_preview
-import random
-import time
-
-def start():
-    grid_h, grid_w = 20, 12
-    canvas_h = 40 * grid_h
-    canvas_w = 40 * (grid_w + 6)  # sağ panel için alan
-    stddraw.setCanvasSize(canvas_w, canvas_h)
-    stddraw.setXscale(-0.5, grid_w + 5.5)
-    stddraw.setYscale(-0.5, grid_h - 0.5)
-
-    Tetromino.grid_height = grid_h
-    Tetromino.grid_width = grid_w
-    grid = GameGrid(grid_h, grid_w)
-
-    current_tetromino = create_tetromino()
-    next_tetromino = create_tetromino()
-    held_tetromino = None
-    can_hold = True
-
-    grid.current_tetromino = current_tetromino
-
-    display_game_menu(grid_h, grid_w)
-
-    fall_delay = 0.5
-    level = 1
-    last_time = time.time()
-    paused = False
-
-    while True:
-        if stddraw.hasNextKeyTyped():
-            key_typed = stddraw.nextKeyTyped()
-            if key_typed == "left":
-                current_tetromino.move("left", grid)
-            elif key_typed == "right":
-                current_tetromino.move("right", grid)
-            elif key_typed == "down":
-                current_tetromino.move("down", grid)
-            elif key_typed == "space":
-                while current_tetromino.move("down", grid):
-                    pass
-            elif key_typed == "up" or key_typed == "r":
-                current_tetromino.rotate(grid)
-            elif key_typed == "h" and can_hold:
-                if held_tetromino is None:
-                    held_tetromino = current_tetromino
-                    current_tetromino = next_tetromino
-                    next_tetromino = create_tetromino()
-                else:
-                    held_tetromino, current_tetromino = current_tetromino, held_tetromino
-                    held_tetromino.bottom_left_cell.y = Tetromino.grid_height - 1
-                can_hold = False
-            elif key_typed == "p":  # Duraklat / Devam
-                paused = not paused
-                while paused:
-                    stddraw.setFontSize(20)
-                    stddraw.setPenColor(Color(255, 255, 0))
-                    stddraw.text(grid_w + 2.5, 5, "PAUSED")
-                    stddraw.show(100)
-                    if stddraw.hasNextKeyTyped():
-                        pause_key = stddraw.nextKeyTyped()
-                        if pause_key == "p":
-                            paused = False
-                        elif pause_key == "r":
-                            start()
-                            return
-                        elif pause_key == "f":
-                            fall_delay *= 0.8
-            elif key_typed == "f":  # Hız artır
-                if level < 15:
-                    level += 1
-                    fall_delay = max(0.05, 0.5 * (0.9 ** level))
-            elif key_typed == "r":  # Yeniden başlat
-                start()
-                return
-
-            stddraw.clearKeysTyped()
-
-        if time.time() - last_time >= fall_delay:
-            success = current_tetromino.move("down", grid)
-            if not success:
-                tiles, pos = current_tetromino.get_min_bounded_tile_matrix(True)
-                game_over = grid.update_grid(tiles, pos)
-
-                for row in grid.tile_matrix:
-                    for tile in row:
-                        if tile is not None and tile.number == 2048:
-                            display_win_screen(grid.score)
-                            return
-
-                if game_over:
-                    display_game_over(grid.score)
-                    return
-
-                current_tetromino = next_tetromino
-                next_tetromino = create_tetromino()
-                grid.current_tetromino = current_tetromino
-                can_hold = True
-
-                if fall_delay > 0.1:
-                    fall_delay *= 0.98
-
-            # ✅ EKRANI GÜNCELLE (Next, Hold, Tuş Bilgileri dahil)
-            grid.display(next_tetromino, held_tetromino, level)
-
-            # 🔽 Sağ panel tuş açıklamaları
-            stddraw.setFontSize(12)
-            stddraw.setPenColor(Color(255, 255, 255))
-            stddraw.text(grid_w + 2.5, 3, "P: Pause/Resume")
-            stddraw.text(grid_w + 2.5, 2, "R: Restart")
-            stddraw.text(grid_w + 2.5, 1, "F: Faster")
-
-            
-            last_time = time.time()
-
-
-
-
-
-def create_tetromino():
-   tetromino_types = ['I', 'O', 'Z', 'T', 'S', 'L', 'J']
-   random_type = random.choice(tetromino_types)
-   return Tetromino(random_type)
-
-
-def display_game_menu(grid_height, grid_width):
-   background_color = Color(42, 69, 99)
-   button_color = Color(25, 255, 228)
-   text_color = Color(31, 160, 239)
-   stddraw.clear(background_color)
-   current_dir = os.path.dirname(os.path.realpath(__file__))
-   img_file = current_dir + "/images/menu_image.png"
-   image_to_display = Picture(img_file)
-   img_center_x, img_center_y = (grid_width - 1) / 2, grid_height - 7
-   stddraw.picture(image_to_display, img_center_x, img_center_y)
-   button_w, button_h = grid_width - 1.5, 2
-   button_blc_x, button_blc_y = img_center_x - button_w / 2, 4
-   stddraw.setPenColor(button_color)
-   stddraw.filledRectangle(button_blc_x, button_blc_y, button_w, button_h)
-   stddraw.setFontFamily("Arial")
-   stddraw.setFontSize(25)
-   stddraw.setPenColor(text_color)
-   stddraw.text(img_center_x, 5, "Click Here to Start the Game")
-   while True:
-      stddraw.show(50)
-      if stddraw.mousePressed():
-         mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
-         if button_blc_x <= mouse_x <= button_blc_x + button_w and \
-            button_blc_y <= mouse_y <= button_blc_y + button_h:
-            break
-
-
-def display_game_over(score):
-   stddraw.clear(Color(0, 0, 0))
-   stddraw.setPenColor(Color(255, 0, 0))
-   stddraw.setFontSize(30)
-   stddraw.text(6, 12, "GAME OVER")
-   stddraw.setFontSize(20)
-   stddraw.setPenColor(Color(255, 255, 255))
-   stddraw.text(6, 10, f"Final Score: {score}")
-   stddraw.text(6, 8, "Press any key to exit")
-   stddraw.show()
-   while not stddraw.hasNextKeyTyped():
-      stddraw.show(100)
-
-
-def display_win_screen(score):
-   stddraw.clear(Color(0, 0, 0))
-   stddraw.setPenColor(Color(0, 255, 0))
-   stddraw.setFontSize(30)
-   stddraw.text(6, 12, "YOU WIN!")
-   stddraw.setFontSize(20)
-   stddraw.setPenColor(Color(255, 255, 255))
-   stddraw.text(6, 10, f"Final Score: {score}")
-   stddraw.text(6, 8, "Press any key to exit")
-   stddraw.show()
-   while not stddraw.hasNextKeyTyped():
-      stddraw.show(100)
-
-
-if __name__ == '__main__':
+import lib.stddraw as stddraw
+from lib.picture import Picture
+from lib.color import Color
+import os
+from game_grid import GameGrid, ArrayGameGrid
+from replay import RecordingEngine  # the game rules with a replay log
+from bot import PlacementBot  # plays the game in the autoplay mode
+from profiler import PhaseProfiler, null_phase  # times the phases of the loop
+from renderer import LayeredRenderer  # redraws only the changed cells
+from renderer import ViewportRenderer, reset_scale  # draws large grids
+import time
+
+# the size of the grid that is drawn on the canvas (a larger grid is drawn
+# through a view of this size that follows the tetromino)
+view_h, view_w = 20, 12
+# the number of the upcoming pieces after the next one shown on the panel
+lookahead = 3
+
+def start(fixed_timestep=True, autoplay=False, profile=False, grid_h=20,
+          grid_w=12, piece_queue="uniform"):
+    session = GameSession(grid_h, grid_w, autoplay, profile, piece_queue)
+    session.run(fixed_timestep)
+
+
+# A class for modeling a game session: the canvas, the game engine, the
+# renderer (and the bot and the profiler when used) are created once, and a
+# restart resets the game in place and plays it again in the same loop, so
+# restarting does not grow the stack or keep the previous games alive (the
+# pieces are drawn from a queue with the given distribution, see PieceQueue)
+class GameSession:
+    def __init__(self, grid_h=20, grid_w=12, autoplay=False, profile=False,
+                 piece_queue="uniform"):
+        large = grid_h > view_h or grid_w > view_w
+        self.layout_h = min(grid_h, view_h)
+        self.layout_w = min(grid_w, view_w)
+        canvas_h = 40 * self.layout_h
+        canvas_w = 40 * (self.layout_w + 6)  # sağ panel için alan
+        stddraw.setCanvasSize(canvas_w, canvas_h)
+        reset_scale(self.layout_h, self.layout_w)
+
+        # the game rules run in the engine, the grid is a GameGrid for drawing
+        # (the actions are recorded for saving a replay of the game at the
+        # end), a large grid stores its tiles in an array and only its view is
+        # drawn
+        self.engine = RecordingEngine(
+            grid_h, grid_w, board_class=ArrayGameGrid if large else GameGrid,
+            piece_queue=piece_queue)
+        if large:
+            self.renderer = ViewportRenderer(self.engine.grid, view_h, view_w)
+        else:
+            self.renderer = LayeredRenderer(self.engine.grid)
+        # the bot plays the game in the autoplay mode and the phases of the
+        # loop are timed in the profile mode (both with the fixed timestep)
+        self.bot = PlacementBot() if autoplay else None
+        self.profiler = PhaseProfiler() if profile else None
+
+    # A method for playing games until a game ends without a restart
+    def run(self, fixed_timestep=True):
+        if self.profiler is not None:
+            self.profiler.instrument(self.engine.grid, self.renderer)
+        try:
+            while True:
+                display_game_menu(self.layout_h, self.layout_w)
+                if fixed_timestep or self.bot is not None or \
+                   self.profiler is not None:
+                    restart = run_fixed_timestep(self.engine, self.renderer,
+                                                 bot=self.bot,
+                                                 profiler=self.profiler)
+                else:
+                    restart = run_variable_timestep(self.engine,
+                                                    self.renderer)
+                if not restart:
+                    return
+                self.restart()
+        finally:
+            if self.profiler is not None:
+                self.profiler.uninstrument()
+                self.profiler.dump()
+
+    # A method for starting a new game with the same engine and renderer (the
+    # new grid is drawn by the renderer and timed by the profiler)
+    def restart(self):
+        if self.profiler is not None:
+            self.profiler.uninstrument()
+        self.engine.reset()
+        self.renderer.reset(self.engine.grid)
+        if self.bot is not None:
+            self.bot.reset()
+        if self.profiler is not None:
+            self.profiler.instrument(self.engine.grid, self.renderer)
+        reset_scale(self.layout_h, self.layout_w)
+
+
+# A function for running the game loop that moves the tetromino down every
+# fall_delay seconds of the wall clock time and draws a frame after each fall
+# (between the falls, it sleeps until a key is typed or the next fall is due),
+# returns whether the game is restarted
+def run_variable_timestep(engine, renderer):
+    grid = engine.grid
+    layout_h = min(engine.grid_height, view_h)
+    layout_w = min(engine.grid_width, view_w)
+    fall_delay = 0.5
+    level = 1
+    last_time = time.time()
+
+    while True:
+        if stddraw.hasNextKeyTyped():
+            key_typed = stddraw.nextKeyTyped()
+            if key_typed in key_actions:
+                engine.step(key_actions[key_typed])
+            elif key_typed == "p":  # Duraklat / Devam
+                restart, fall_delay = pause_game(layout_w, fall_delay)
+                if restart:
+                    return True
+            elif key_typed == "f":  # Hız artır
+                if level < 15:
+                    level += 1
+                    fall_delay = max(0.05, 0.5 * (0.9 ** level))
+
+            stddraw.clearKeysTyped()
+
+        if time.time() - last_time >= fall_delay:
+            locked = engine.step("tick")
+
+            if engine.won:
+                save_replay(engine)
+                reset_scale(layout_h, layout_w)
+                display_win_screen(grid.score)
+                return False
+
+            if engine.done:
+                save_replay(engine)
+                reset_scale(layout_h, layout_w)
+                display_game_over(grid.score)
+                return False
+
+            if locked and fall_delay > 0.1:
+                fall_delay *= 0.98
+
+            # ✅ EKRANI GÜNCELLE (Next, Hold, Tuş Bilgileri dahil)
+            renderer.display(engine.next_tetromino, engine.held_tetromino,
+                             level, upcoming=engine.upcoming_types(lookahead))
+
+            last_time = time.time()
+
+        wait_for_key(last_time + fall_delay - time.time())
+
+
+# A function for running the game loop with a fixed timestep: the game is
+# simulated in ticks of a fixed duration (all the keys typed are applied in each
+# tick and gravity moves the tetromino down every fall_delay seconds of the
+# simulated time), while the frames are drawn only when the game changes and
+# at most max_fps times per second without blocking, so a move is shown in the
+# next frame instead of waiting for the next fall of the tetromino (when a bot
+# is given, it plays all the actions for each tetromino in one tick instead of
+# the keys, and when a profiler is given, the phases of the loop are timed and
+# T prints them; when the renderer draws a view of the grid, + and - zoom the
+# view in and out;
+# without a bot, the loop sleeps until a key is typed, the next fall is due or
+# a changed frame can be drawn), returns whether the game is restarted
+def run_fixed_timestep(engine, renderer, tick_rate=120, max_fps=60, bot=None,
+                       profiler=None):
+    phase = null_phase if profiler is None else profiler.phase
+    grid = engine.grid
+    layout_h = min(engine.grid_height, view_h)
+    layout_w = min(engine.grid_width, view_w)
+    can_zoom = hasattr(renderer, "zoom")
+    tick_time, frame_time = 1.0 / tick_rate, 1.0 / max_fps
+    fall_delay = 0.5
+    level = 1
+    lag = 0.0  # the time that is not simulated yet
+    fall_time = 0.0  # the simulated time since the last fall
+    last_frame_time = None
+    changed = True  # the game is changed since the last frame
+    previous_time = time.perf_counter()
+
+    while True:
+        current_time = time.perf_counter()
+        # the lag is limited so that a stall does not cause a burst of ticks
+        lag = min(lag + current_time - previous_time, 0.25)
+        previous_time = current_time
+
+        while lag >= tick_time:
+            lag -= tick_time
+            if bot is not None:
+                with phase("bot"):
+                    actions = bot.next_actions(engine)
+                for action in actions:
+                    engine.step(action)
+                if actions:
+                    changed = True
+            paused = False
+            with phase("input"):
+                while stddraw.hasNextKeyTyped():
+                    key_typed = stddraw.nextKeyTyped()
+                    if key_typed in key_actions:
+                        engine.step(key_actions[key_typed])
+                        changed = True
+                    elif key_typed == "p":  # Duraklat / Devam
+                        paused = True
+                        break
+                    elif key_typed == "f":  # Hız artır
+                        if level < 15:
+                            level += 1
+                            fall_delay = max(0.05, 0.5 * (0.9 ** level))
+                            changed = True
+                    elif key_typed == "t" and profiler is not None:
+                        profiler.dump()  # Zamanlamaları yazdır
+                    elif key_typed in ("+", "=", "-") and can_zoom:
+                        renderer.zoom(1 if key_typed == "-" else -1)
+                        changed = True
+            # the time while the game is paused is not timed as input
+            if paused:
+                restart, fall_delay = pause_game(layout_w, fall_delay)
+                if restart:
+                    return True
+                previous_time = time.perf_counter()
+                changed = True
+
+            fall_time += tick_time
+            if fall_time >= fall_delay:
+                fall_time = 0.0
+                with phase("gravity"):
+                    locked = engine.step("tick")
+                changed = True
+
+                if engine.won:
+                    save_replay(engine)
+                    reset_scale(layout_h, layout_w)
+                    display_win_screen(grid.score)
+                    return False
+
+                if engine.done:
+                    save_replay(engine)
+                    reset_scale(layout_h, layout_w)
+                    display_game_over(grid.score)
+                    return False
+
+                if locked and fall_delay > 0.1:
+                    fall_delay *= 0.98
+
+        if changed and (last_frame_time is None or
+                        current_time - last_frame_time >= frame_time):
+            renderer.display(engine.next_tetromino, engine.held_tetromino,
+                             level, show_delay=0,
+                             upcoming=engine.upcoming_types(lookahead))
+            last_frame_time = current_time
+            changed = False
+        elif bot is not None:
+            # the frame is unchanged, so only the keyboard is polled until the
+            # next tick
+            wait_for_key(max(0.0, tick_time - lag))
+        else:
+            # nothing changes until a key is typed or the next fall (the wait
+            # is limited so that the lag does not exceed its limit)
+            wait = fall_delay - fall_time - lag
+            if changed:
+                wait = min(wait, frame_time - (current_time - last_frame_time))
+            wait_for_key(min(wait, 0.2))
+
+
+# A function for showing the pause screen until the game is resumed (P) or
+# restarted (R), the fall delay can be decreased with F while paused. Returns
+# whether the game is restarted and the fall delay
+def pause_game(grid_w, fall_delay):
+    stddraw.setFontSize(20)
+    stddraw.setPenColor(Color(255, 255, 0))
+    stddraw.text(grid_w + 2.5, 5, "PAUSED")
+    stddraw.show(0)
+    while True:
+        wait_for_key(poll_interval=screen_poll_interval)
+        pause_key = stddraw.nextKeyTyped()
+        if pause_key == "p":
+            return False, fall_delay
+        elif pause_key == "r":
+            return True, fall_delay
+        elif pause_key == "f":
+            fall_delay *= 0.8
+
+
+# the longest time (in seconds) that the game loops sleep without polling the
+# keyboard, which bounds the delay before a typed key is handled, and the
+# polling interval of the screens that only wait for a key
+input_poll_interval = 1.0 / 60
+screen_poll_interval = 0.1
+
+
+# A function for sleeping until a key is typed or the given number of seconds
+# passes (no limit if None) without keeping the CPU busy: the keyboard is
+# polled every poll_interval seconds and the sleeps are not inside
+# stddraw.show, so the time of showing the frames (e.g. the show phase of the
+# profiler) does not include the idle time. Returns whether a key is typed
+def wait_for_key(timeout=None, poll_interval=input_poll_interval):
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    while True:
+        poll_events()
+        if stddraw.hasNextKeyTyped():
+            return True
+        wait = poll_interval
+        if deadline is not None:
+            wait = min(wait, deadline - time.perf_counter())
+            if wait <= 0:
+                return False
+        time.sleep(wait)
+
+
+# A function for processing the keyboard and mouse events of the window
+# without showing the frame again (stddraw processes them in show, which is
+# only used when its event function is not available)
+def poll_events():
+    check_events = getattr(stddraw, "_checkForEvents", None)
+    if check_events is None:
+        stddraw.show(0)
+    else:
+        check_events()
+
+
+# A function for saving the replay log of the game of a given RecordingEngine
+# to the replays directory (the file is named after the seed of the game), the
+# game can be checked again with python replay.py replays/<seed>.t2r
+def save_replay(engine):
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    replay_dir = os.path.join(current_dir, "replays")
+    os.makedirs(replay_dir, exist_ok=True)
+    log = engine.finish_log()
+    log.save(os.path.join(replay_dir, f"{log.seed}.t2r"))
+
+
+# the pictures loaded from the images directory, which are decoded once and
+# kept for the whole process (e.g. the menu image shown for each game)
+pictures = {}
+
+
+# A function that returns the picture in the given file of the images
+# directory (loaded only the first time it is needed)
+def load_picture(file_name):
+    picture = pictures.get(file_name)
+    if picture is None:
+        current_dir = os.path.dirname(os.path.realpath(__file__))
+        picture = Picture(os.path.join(current_dir, "images", file_name))
+        pictures[file_name] = picture
+    return picture
+
+
+# the keys that are mapped to the actions of the game engine
+key_actions = {"left": "left", "right": "right", "down": "down",
+               "space": "hard_drop", "up": "rotate", "r": "rotate",
+               "h": "hold"}
+
+
+def display_game_menu(grid_height, grid_width):
+   background_color = Color(42, 69, 99)
+   button_color = Color(25, 255, 228)
+   text_color = Color(31, 160, 239)
+   stddraw.clear(background_color)
+   image_to_display = load_picture("menu_image.png")
+   img_center_x, img_center_y = (grid_width - 1) / 2, grid_height - 7
+   stddraw.picture(image_to_display, img_center_x, img_center_y)
+   button_w, button_h = grid_width - 1.5, 2
+   button_blc_x, button_blc_y = img_center_x - button_w / 2, 4
+   stddraw.setPenColor(button_color)
+   stddraw.filledRectangle(button_blc_x, button_blc_y, button_w, button_h)
+   stddraw.setFontFamily("Arial")
+   stddraw.setFontSize(25)
+   stddraw.setPenColor(text_color)
+   stddraw.text(img_center_x, 5, "Click Here to Start the Game")
+   while True:
+      stddraw.show(50)
+      if stddraw.mousePressed():
+         mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
+         if button_blc_x <= mouse_x <= button_blc_x + button_w and \
+            button_blc_y <= mouse_y <= button_blc_y + button_h:
+            break
+
+
+def display_game_over(score):
+   stddraw.clear(Color(0, 0, 0))
+   stddraw.setPenColor(Color(255, 0, 0))
+   stddraw.setFontSize(30)
+   stddraw.text(6, 12, "GAME OVER")
+   stddraw.setFontSize(20)
+   stddraw.setPenColor(Color(255, 255, 255))
+   stddraw.text(6, 10, f"Final Score: {score}")
+   stddraw.text(6, 8, "Press any key to exit")
+   stddraw.show()
+   wait_for_key(poll_interval=screen_poll_interval)
+
+
+def display_win_screen(score):
+   stddraw.clear(Color(0, 0, 0))
+   stddraw.setPenColor(Color(0, 255, 0))
+   stddraw.setFontSize(30)
+   stddraw.text(6, 12, "YOU WIN!")
+   stddraw.setFontSize(20)
+   stddraw.setPenColor(Color(255, 255, 255))
+   stddraw.text(6, 10, f"Final Score: {score}")
+   stddraw.text(6, 8, "Press any key to exit")
+   stddraw.show()
+   wait_for_key(poll_interval=screen_poll_interval)
+
+
+if __name__ == '__main__':
    start()
\ No newline at end of file
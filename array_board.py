@@ -0,0 +1,286 @@
+from board import Board  # the interface (and the rules) of the game grid
+from grid_ops import merge_columns, clear_full_rows, connected_cells
+from grid_ops import column_heights, sum_numbers
+from tile import Tile  # used for drawing the tiles of the board
+import numpy as np  # the fundamental Python module for scientific computing
+
+
+# A class for modeling the game grid as a compact integer array instead of an
+# array of Tile objects: each cell stores the log2 of the number on its tile
+# (1 for 2, 2 for 4, ...) and 0 when it is empty, so a 20x12 board takes 240
+# bytes and it can be copied, hashed and compared without creating objects.
+# The merges and the clears are only applied to the region changed by each
+# lock (the columns that may have equal tiles on top of each other and the
+# rows from the lowest changed row up), and the free tiles are only searched
+# when tiles are moved, so most locks on large boards do not scan the board
+class ArrayBoard(Board):
+   # A constructor for creating the board with given dimensions
+   def __init__(self, grid_h, grid_w):
+      super().__init__(grid_h, grid_w)
+      # the number of tiles and of the pairs of equal tiles on top of each
+      # other in each column (see get_features)
+      self.column_tiles = np.zeros(grid_w, dtype=int)
+      self.column_pairs = np.zeros(grid_w, dtype=int)
+      self.mark_changed()
+
+   # (the cells are the log2 values of the tiles, 0 for the empty cells)
+   def init_cells(self):
+      self.values = np.zeros((self.grid_height, self.grid_width), dtype=np.int8)
+
+   # A read-only view that gives Tile-like access to the cells of the board
+   # (tile_matrix[row][col] is a TileView or None as in the Board class)
+   @property
+   def tile_matrix(self):
+      return TileMatrixView(self)
+
+   # A method that returns the log2 values of the tiles on this board (the
+   # array is not copied, see Board.get_values)
+   def get_values(self):
+      return self.values
+
+   # A method for getting the number on the tile in a given cell (0 if empty)
+   def get_number(self, row, col):
+      exponent = int(self.values[row, col])
+      return 1 << exponent if exponent else 0
+
+   def is_occupied(self, row, col):
+      if not self.is_inside(row, col):
+         return False
+      return self.values[row, col] != 0
+
+   def get_occupied(self):
+      return self.values != 0
+
+   def lock_tiles(self, tiles_to_lock, blc_position):
+      locked_cells, exponents = [], []
+      replaced = []  # the log2 values of the tiles that are overwritten
+      n_rows, n_cols = len(tiles_to_lock), len(tiles_to_lock[0])
+      for col in range(n_cols):
+         for row in range(n_rows):
+            if tiles_to_lock[row][col] is not None:
+               x = blc_position.x + col
+               y = blc_position.y + (n_rows - 1) - row
+               if self.is_inside(y, x):
+                  exponent = tiles_to_lock[row][col].number.bit_length() - 1
+                  if self.values[y, x]:
+                     replaced.append(self.values[y, x])
+                  self.values[y, x] = exponent
+                  locked_cells.append((y, x))
+                  exponents.append(exponent)
+                  self.merge_candidates[x] = True
+                  self.changed_columns[x] = True
+               else:
+                  self.game_over = True
+      self.lowest_changed_row = min([self.lowest_changed_row] +
+                                    [y for y, _ in locked_cells])
+      self.update_tile_counts(exponents)
+      if replaced:
+         self.update_tile_counts(replaced, -1)
+      return locked_cells
+
+   # A method for marking the whole board as changed (e.g. when its values are
+   # set directly), so the rules are applied to all the cells by the next lock
+   def mark_changed(self):
+      # the columns that may have equal tiles on top of each other
+      self.merge_candidates = np.ones(self.grid_width, dtype=bool)
+      # the lowest row that is changed since the full rows are cleared (the
+      # rows below it cannot become full)
+      self.lowest_changed_row = 0
+      # the columns that are changed since their features are counted
+      self.changed_columns = np.ones(self.grid_width, dtype=bool)
+
+   # A method for marking the whole board as changed for the features but only
+   # the columns with equal tiles on top of each other and the rows from the
+   # lowest full row up for the rules (e.g. when a settled board is restored,
+   # the next lock then only merges and clears around the locked tiles)
+   def mark_restored(self):
+      self.mark_changed()
+      values = self.values
+      self.merge_candidates[:] = np.any(
+         (values[:-1] == values[1:]) & (values[:-1] != 0), axis=0)
+      full_rows = np.flatnonzero(np.all(values != 0, axis=1))
+      self.lowest_changed_row = int(full_rows[0]) if len(full_rows) else \
+         self.grid_height
+
+   # (only the columns that may have equal tiles on top of each other are
+   # merged, up to their highest tile, the values are not copied)
+   def merge_tiles(self):
+      cols = np.flatnonzero(self.merge_candidates)
+      if len(cols) == 0:
+         return self.values
+      top = int(self.column_heights[cols].max())
+      if top == 0:
+         self.merge_candidates[cols] = False  # the columns are empty
+         return self.values
+      region = np.ascontiguousarray(self.values[:top, cols])
+      score, sources = merge_columns(region, return_sources=True)
+      # the columns where a merge leaves equal tiles on top of each other
+      self.merge_candidates[cols] = np.any(
+         (region[:-1] == region[1:]) & (region[:-1] != 0), axis=0)
+      if not score:
+         return self.values
+      self.update_tile_counts(region)
+      self.update_tile_counts(self.values[:top, cols], -1)
+      self.values[:top, cols] = region
+      self.column_heights[cols] = column_heights(region != 0)
+      self.changed_columns[cols] = True
+      moved_rows = np.flatnonzero(np.any(sources != np.arange(top)[:, None],
+                                         axis=1))
+      self.lowest_changed_row = min(self.lowest_changed_row,
+                                    int(moved_rows[0]))
+      self.score += score
+      return self.values
+
+   # (only the rows from the lowest changed row up can be full, as the full
+   # rows are cleared by each lock, the given values are the ones of the board)
+   def clear_full_rows(self, values=None):
+      bottom = self.lowest_changed_row
+      self.lowest_changed_row = self.grid_height  # no full rows are left
+      top = int(self.column_heights.max())
+      if bottom >= top:
+         return
+      rows = self.values[bottom:top]
+      full = np.all(rows != 0, axis=1)
+      if not np.any(full):
+         return
+      self.update_tile_counts(rows[full], -1)
+      score, sources = clear_full_rows(self.values[bottom:])
+      self.score += score
+      self.lines_cleared += int(np.count_nonzero(sources == -1))
+      self.update_column_heights()
+      # the tiles above the cleared rows are moved down in all the columns
+      self.merge_candidates[:] = True
+      self.changed_columns[:] = True
+
+   def remove_free_tiles(self):
+      occupied = self.values != 0
+      free = occupied & ~connected_cells(occupied)
+      if np.any(free):
+         self.score += int(sum_numbers(self.values[free]))
+         self.update_tile_counts(self.values[free], -1)
+         self.values[free] = 0
+         self.changed_columns |= np.any(free, axis=0)
+         self.update_column_heights()
+      self.tiles_connected = True
+
+   # (the heights are updated in place, so the views of them stay valid)
+   def update_column_heights(self):
+      self.column_heights[:] = column_heights(self.values != 0)
+
+   # the names of the features returned by get_features
+   feature_names = ("holes", "bumpiness", "merge_pairs", "max_height",
+                    "aggregate_height")
+
+   # A method that returns the features of the board as an integer array (see
+   # feature_names): the number of empty cells below the top of their columns
+   # (holes), the sum of the height differences of the neighboring columns,
+   # the number of pairs of equal tiles on top of each other and the maximum
+   # and the sum of the column heights. The tiles and the pairs are counted
+   # again only in the columns changed since the last call, and the other
+   # features are computed from the column heights, which are kept up to date
+   # by the rules
+   def get_features(self):
+      self.update_column_features()
+      heights = self.column_heights
+      return np.array([int(heights.sum() - self.column_tiles.sum()),
+                       int(np.abs(np.diff(heights)).sum()),
+                       int(self.column_pairs.sum()), int(heights.max()),
+                       int(heights.sum())], dtype=np.int64)
+
+   # A method that returns the number of holes in each column (see
+   # get_features)
+   def get_column_holes(self):
+      self.update_column_features()
+      return self.column_heights - self.column_tiles
+
+   # A method for counting the tiles and the pairs of equal tiles in the
+   # columns that are changed since they were counted (up to their heights)
+   def update_column_features(self):
+      cols = np.flatnonzero(self.changed_columns)
+      if len(cols) == 0:
+         return
+      top = int(self.column_heights[cols].max())
+      region = self.values[:top, cols]
+      self.column_tiles[cols] = np.count_nonzero(region, axis=0)
+      self.column_pairs[cols] = np.count_nonzero(
+         (region[:-1] == region[1:]) & (region[:-1] != 0), axis=0)
+      self.changed_columns[cols] = False
+
+   def restore(self, snapshot):
+      data, self.score, self.game_over, self.lines_cleared, \
+         self.tiles_connected = snapshot
+      self.values[:] = np.frombuffer(data, dtype=np.int8).reshape(
+         self.grid_height, self.grid_width)
+      self.update_column_heights()
+      self.reset_tile_counts()
+      self.mark_restored()
+      self.n_updates += 1
+
+   # A method that returns a copy of this board (the tetromino is not copied)
+   def copy(self):
+      board = type(self).__new__(type(self))
+      board.__dict__.update(self.__dict__)
+      board.values = self.values.copy()
+      board.column_heights = self.column_heights.copy()
+      board.merge_candidates = self.merge_candidates.copy()
+      board.tile_counts = self.tile_counts.copy()
+      board.changed_columns = self.changed_columns.copy()
+      board.column_tiles = self.column_tiles.copy()
+      board.column_pairs = self.column_pairs.copy()
+      return board
+
+   # A method that returns the cells of this board as bytes, which can be
+   # used for hashing and comparing boards (see also from_bytes)
+   def tobytes(self):
+      return self.values.tobytes()
+
+   # A method for creating a board from the bytes returned by tobytes
+   @classmethod
+   def from_bytes(cls, grid_h, grid_w, data, score=0):
+      board = cls(grid_h, grid_w)
+      board.values[:] = np.frombuffer(data, dtype=np.int8).reshape(grid_h,
+                                                                   grid_w)
+      board.score = score
+      board.tiles_connected = False  # the given tiles may not be connected
+      board.update_column_heights()
+      board.reset_tile_counts()
+      board.n_updates += 1
+      return board
+
+
+# A class for modeling a read-only tile in a given cell of an ArrayBoard,
+# which can be drawn like the Tile objects in the Board class
+class TileView(Tile):
+   # A constructor for creating the view of the tile in a given cell
+   def __init__(self, board, row, col):
+      self.board, self.row, self.col = board, row, col
+
+   @property
+   def number(self):
+      return self.board.get_number(self.row, self.col)
+
+
+# A class for modeling a read-only view of the cells of an ArrayBoard as a
+# matrix of TileView objects (None for the empty cells)
+class TileMatrixView:
+   def __init__(self, board):
+      self.board = board
+
+   def __len__(self):
+      return self.board.grid_height
+
+   def __getitem__(self, index):
+      if isinstance(index, tuple):
+         row, col = index
+         return self.row(row)[col]
+      return self.row(index)
+
+   def __iter__(self):
+      for row in range(self.board.grid_height):
+         yield self.row(row)
+
+   # A method that returns the tiles in a given row of the board
+   def row(self, row):
+      values = self.board.values[row]
+      return [TileView(self.board, row, col) if values[col] else None
+              for col in range(self.board.grid_width)]
@@ -0,0 +1,139 @@
+from grid_ops import merge_columns, clear_full_rows, connected_cells
+from grid_ops import column_heights, sum_numbers
+from tetromino import Tetromino  # the shapes and rotations of the pieces
+import numpy as np  # the fundamental Python module for scientific computing
+
+
+# A class for simulating many games at once: the grids of all the games are
+# kept in a single (n, h, w) integer array of log2 tile values (as in
+# ArrayBoard) and each call of the drop method places a piece on every grid and
+# applies the rules of the game (merging, clearing the full rows and removing
+# the free tiles) to all the grids with the vectorized functions in grid_ops.
+# Instead of moving the pieces step by step, a piece is dropped straight down
+# from the top of the grid with a given rotation and column (as a hard drop
+# right after it is spawned), which is what Monte Carlo runs of placement
+# policies need.
+class BatchEngine:
+   # the types of the pieces (the index of each type is used in the arrays)
+   types = tuple(Tetromino.shapes)
+   # the game is won when a tile with this number is created
+   win_number = 2048
+
+   # A constructor for creating n_games games on grids with given dimensions,
+   # the pieces and the numbers on their tiles are drawn from a random number
+   # generator with the given seed
+   def __init__(self, n_games, grid_h=20, grid_w=12, seed=None):
+      self.n_games = n_games
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.rng = np.random.default_rng(seed)
+      # the offsets (dx, dy) of the 4 tiles of each type in each rotation
+      self.offsets = np.array([[rotation.offsets
+                                for rotation in Tetromino.rotations[shape]]
+                               for shape in self.types])  # (types, 4, 4, 2)
+      # the columns of the bottom left cell that keep each rotation inside
+      self.min_col = np.array([[-rotation.min_dx
+                                for rotation in Tetromino.rotations[shape]]
+                               for shape in self.types])
+      self.max_col = np.array([[grid_w - 1 - rotation.max_dx
+                                for rotation in Tetromino.rotations[shape]]
+                               for shape in self.types])
+      self.reset()
+
+   # A method for starting new games on empty grids
+   def reset(self):
+      n, h, w = self.n_games, self.grid_height, self.grid_width
+      self.values = np.zeros((n, h, w), dtype=np.int8)
+      self.scores = np.zeros(n, dtype=np.int64)
+      self.pieces_placed = np.zeros(n, dtype=np.int64)
+      self.won = np.zeros(n, dtype=bool)  # a tile with win_number is created
+      self.game_over = np.zeros(n, dtype=bool)  # a piece did not fit
+      self.spawn_pieces()
+
+   # the games that are over (won or lost)
+   @property
+   def done(self):
+      return self.won | self.game_over
+
+   # A method for choosing the next piece of each game (its type and the log2
+   # values of the numbers on its tiles, 2 with 90% and 4 with 10% chance)
+   def spawn_pieces(self):
+      self.piece_types = self.rng.integers(len(self.types), size=self.n_games)
+      self.piece_values = np.where(self.rng.random((self.n_games, 4)) < 0.1,
+                                   2, 1).astype(np.int8)
+
+   # A method that returns a random rotation and a random column for the
+   # piece of each game, which keep the piece inside the grid
+   def random_placements(self):
+      rotations = self.rng.integers(4, size=self.n_games)
+      min_col = self.min_col[self.piece_types, rotations]
+      max_col = self.max_col[self.piece_types, rotations]
+      cols = min_col + (self.rng.random(self.n_games) *
+                        (max_col - min_col + 1)).astype(int)
+      return rotations, cols
+
+   # A method for dropping the current piece of each game that is not over
+   # with the given rotation (0-3) and column of its bottom left cell (arrays
+   # with a value for each game), returns the score gained in each game
+   def drop(self, rotations, cols):
+      rotations = np.asarray(rotations) % 4
+      cols = np.asarray(cols)
+      active = np.flatnonzero(~self.done)
+      types = self.piece_types[active]
+      rotations, cols = rotations[active], cols[active]
+      if np.any(cols < self.min_col[types, rotations]) or \
+         np.any(cols > self.max_col[types, rotations]):
+         raise ValueError("The pieces must be dropped inside the grids")
+
+      # each piece stops when one of its tiles lands on a column
+      offsets = self.offsets[types, rotations]  # (k, 4, 2)
+      tile_cols = cols[:, None] + offsets[:, :, 0]
+      values = self.values[active]
+      heights = column_heights(values != 0)
+      landing_heights = np.take_along_axis(heights, tile_cols, axis=1)
+      rows = np.max(landing_heights - offsets[:, :, 1], axis=1)
+      tile_rows = rows[:, None] + offsets[:, :, 1]
+
+      # the tiles above the grid are not locked and the game is over
+      inside = tile_rows < self.grid_height
+      self.game_over[active[~inside.all(axis=1)]] = True
+      games = np.broadcast_to(np.arange(len(active))[:, None], inside.shape)
+      values[games[inside], tile_rows[inside], tile_cols[inside]] = \
+         self.piece_values[active][inside]
+
+      # apply the rules of the game to all the grids with a dropped piece
+      scores, _ = merge_columns(values)
+      cleared_scores, _ = clear_full_rows(values)
+      scores += cleared_scores
+      # a piece dropped straight down is always connected, so the tiles can
+      # only become free on the grids where tiles are merged or cleared
+      changed = np.flatnonzero(scores)
+      occupied = values[changed] != 0
+      free = occupied & ~connected_cells(occupied)
+      games, free_rows, free_cols = np.nonzero(free)
+      if len(games):
+         games = changed[games]
+         np.add.at(scores, games,
+                   sum_numbers(values[games, free_rows, free_cols], axis=()))
+         values[games, free_rows, free_cols] = 0
+
+      self.values[active] = values
+      self.scores[active] += scores
+      self.pieces_placed[active] += 1
+      win_exponent = self.win_number.bit_length() - 1
+      # a game is won when a tile with exactly win_number is on its grid (as in
+      # GameEngine.has_winning_tile)
+      self.won[active] = np.any(values == win_exponent, axis=(1, 2))
+      gained = np.zeros(self.n_games, dtype=np.int64)
+      gained[active] = scores
+      self.spawn_pieces()
+      return gained
+
+   # A method for playing all the games with random placements until they are
+   # over or max_pieces pieces are placed in each game, returns the scores
+   def play_random(self, max_pieces=1000):
+      for _ in range(max_pieces):
+         if np.all(self.done):
+            break
+         self.drop(*self.random_placements())
+      return self.scores
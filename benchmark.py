@@ -0,0 +1,167 @@
+from board import Board  # the game rules on Tile objects (as in GameGrid)
+from array_board import ArrayBoard  # the game rules on an integer array
+from tetromino import Tetromino  # the falling pieces
+from self_play import play_game  # used for timing the full headless games
+from framebuffer import FrameRenderer  # used for timing the offscreen frames
+import numpy as np  # the fundamental Python module for scientific computing
+import argparse  # used for the command line options
+import json  # used for printing the results
+import platform  # used for describing the machine in the results
+import random  # used for the seeded random number generators
+import statistics  # used for the median of the timings
+import time  # used for timing
+
+# A benchmark suite for the hot paths of the game engine: the lock pipeline of
+# the boards (update_grid and its stages), the tetromino operations and the
+# full headless games. The boards are synthetic, generated with fixed seeds
+# for several sizes and fill densities, so the results of different versions
+# can be compared. The results are printed (or saved) as JSON, e.g.
+# python benchmark.py --output results.json
+
+# the board sizes (height, width) and the fill densities of the benchmarks
+sizes = [(20, 12), (40, 24), (100, 60)]
+densities = [0.3, 0.6, 0.9]
+board_classes = [Board, ArrayBoard]
+
+
+# A function that returns a snapshot (see Board.snapshot) of a synthetic board
+# with the given size where the given fraction of the cells in the bottom 3/4
+# of the rows have tiles with the numbers 2 to 64
+def synthetic_board(grid_h, grid_w, density, seed):
+   rng = np.random.default_rng(seed)
+   values = rng.integers(1, 7, size=(grid_h, grid_w)).astype(np.int8)
+   values[rng.random((grid_h, grid_w)) >= density] = 0
+   values[grid_h * 3 // 4:] = 0
+   return (values.tobytes(), 0, False, 0, False)
+
+
+# A function for timing the given function for number calls (the setup
+# function is called before each call and it is not timed, its result is given
+# to the function), returns the timings in microseconds per call
+def measure(func, setup=None, number=200):
+   timings = []
+   for _ in range(number):
+      arg = setup() if setup is not None else None
+      start = time.perf_counter()
+      func(arg)
+      timings.append((time.perf_counter() - start) * 1e6)
+   return {"calls": number, "best_us": round(min(timings), 3),
+           "median_us": round(statistics.median(timings), 3),
+           "mean_us": round(statistics.fmean(timings), 3)}
+
+
+# A function that returns the results of the benchmarks of the lock pipeline
+# and the tetromino operations for a board class, a size and a density
+def bench_board(board_class, grid_h, grid_w, density, number):
+   seed = grid_h * 1000 + grid_w * 10 + int(density * 10)
+   snapshot = synthetic_board(grid_h, grid_w, density, seed)
+   board = board_class(grid_h, grid_w)
+   board.restore(snapshot)
+   rng = random.Random(seed)
+   # a T tetromino in the middle of the empty rows at the top (where it can be
+   # rotated), dropped on the board
+   tetromino = Tetromino("T", grid_h, grid_w, rng)
+   tetromino.bottom_left_cell.x = grid_w // 2 - 1
+   tetromino.bottom_left_cell.y = grid_h - 4
+   falling = tetromino.snapshot()
+   tetromino.hard_drop(board)
+   dropped = tetromino.snapshot()
+
+   # a fresh board for each call of a stage of the lock pipeline
+   def fresh_board():
+      board.restore(snapshot)
+      return board
+
+   # a fresh board with the tiles and the position of the dropped tetromino
+   def locking():
+      board.restore(snapshot)
+      piece = Tetromino.from_snapshot(dropped)
+      return piece.get_min_bounded_tile_matrix(True)
+
+   def falling_tetromino():
+      return Tetromino.from_snapshot(falling)
+
+   board.restore(snapshot)
+   piece = Tetromino.from_snapshot(falling)
+   results = {
+      "update_grid": measure(lambda args: board.update_grid(*args), locking,
+                             number),
+      "merge_tiles": measure(lambda b: b.merge_tiles(), fresh_board, number),
+      "clear_full_rows": measure(lambda b: b.clear_full_rows(), fresh_board,
+                                 number),
+      "remove_free_tiles": measure(lambda b: b.remove_free_tiles(),
+                                   fresh_board, number),
+   }
+   board.restore(snapshot)
+   results.update({
+      "can_be_moved": measure(lambda _: (piece.can_be_moved("left", board),
+                                         piece.can_be_moved("right", board),
+                                         piece.can_be_moved("down", board)),
+                              number=number),
+      "rotate": measure(lambda t: t.rotate(board), falling_tetromino, number),
+      "get_ghost_copy": measure(lambda _: piece.get_ghost_copy(board),
+                                number=number),
+      "get_reachable_columns": measure(
+         lambda _: piece.get_reachable_columns(board), number=number),
+      "get_min_bounded_tile_matrix": measure(
+         lambda _: piece.get_min_bounded_tile_matrix(True), number=number),
+   })
+   renderer = FrameRenderer(grid_h, grid_w, cell_size=8)
+   results["render_frame"] = measure(
+      lambda _: renderer.render(board.get_values(), piece, board, board.score),
+      number=number)
+   return [{"benchmark": name, "board": board_class.__name__,
+            "size": f"{grid_h}x{grid_w}", "density": density, **result}
+           for name, result in results.items()]
+
+
+# A function that returns the number of full headless games (with random
+# placements, see self_play.play_game) played per second
+def bench_games(n_games):
+   start = time.perf_counter()
+   pieces = 0
+   for seed in range(n_games):
+      pieces += play_game(seed)["pieces_placed"]
+   elapsed = time.perf_counter() - start
+   return {"benchmark": "headless_games", "games": n_games,
+           "games_per_second": round(n_games / elapsed, 3),
+           "pieces_per_second": round(pieces / elapsed, 3)}
+
+
+# A function that runs all the benchmarks and returns the results with a
+# description of the machine
+def run_benchmarks(number=200, n_games=20):
+   results = []
+   for board_class in board_classes:
+      for grid_h, grid_w in sizes:
+         for density in densities:
+            results.extend(bench_board(board_class, grid_h, grid_w, density,
+                                       number))
+   results.append(bench_games(n_games))
+   return {"machine": {"python": platform.python_version(),
+                       "numpy": np.__version__,
+                       "platform": platform.platform(),
+                       "processor": platform.processor()},
+           "results": results}
+
+
+# A function for running the benchmarks from the command line
+def main():
+   parser = argparse.ArgumentParser(description="Benchmark the game engine")
+   parser.add_argument("--number", type=int, default=200,
+                       help="the number of timed calls of each operation")
+   parser.add_argument("--games", type=int, default=20,
+                       help="the number of headless games to play")
+   parser.add_argument("--output", help="a file for the JSON results "
+                                        "(printed when not given)")
+   args = parser.parse_args()
+   report = json.dumps(run_benchmarks(args.number, args.games), indent=2)
+   if args.output:
+      with open(args.output, "w") as file:
+         file.write(report + "\n")
+   else:
+      print(report)
+
+
+if __name__ == '__main__':
+   main()
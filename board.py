@@ -0,0 +1,273 @@
+from point import Point  # used for tile positions
+from tile import Tile  # used for restoring the tiles from snapshots
+from grid_ops import merge_columns, clear_full_rows, connected_cells
+from grid_ops import column_heights, fitting_columns
+import numpy as np  # the fundamental Python module for scientific computing
+from collections import deque  # used for checking the locked tiles
+
+
+# A class for modeling the game grid without any drawing, i.e. only the rules
+# for locking tetrominoes, merging tiles, clearing rows and removing free tiles
+# (GameGrid extends this class with the drawing methods)
+class Board:
+   # the number of the log2 values of the tiles that are counted (1 for 2, 2
+   # for 4, ..., 63 for 2^63, 0 is not used)
+   n_exponents = 64
+
+   # A constructor for creating the board with given dimensions
+   def __init__(self, grid_h, grid_w):
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.init_cells()
+      self.current_tetromino = None
+      self.game_over = False
+      self.score = 0  # 🔥 Yeni: skor değişkeni
+      # all the tiles are connected to the bottom row (there are no free tiles
+      # on the grid) unless the grid is changed without calling update_grid
+      self.tiles_connected = True
+      # the height of each column (the row above its highest tile), which is
+      # kept up to date as the tiles are locked, merged, cleared or removed
+      self.column_heights = np.zeros(grid_w, dtype=int)
+      self.lines_cleared = 0  # the number of full rows cleared so far
+      # the number of tiles with each log2 value and the largest log2 value on
+      # the grid (0 if it is empty), which are kept up to date by the rules
+      self.tile_counts = np.zeros(Board.n_exponents, dtype=np.int64)
+      self.max_exponent = 0
+      # target_reached is set when a tile with the target number (if given,
+      # e.g. the winning number of the game) is on the grid after a lock
+      self.target_number = None
+      self.target_reached = False
+      # the number of times the tiles are changed by a lock or a restore (e.g.
+      # for redrawing the tiles only when they are changed)
+      self.n_updates = 0
+
+   # A method for creating the empty cells of the board (the subclasses that
+   # store the cells in another way override it)
+   def init_cells(self):
+      self.tile_matrix = np.full((self.grid_height, self.grid_width), None)
+
+   def is_occupied(self, row, col):
+      if not self.is_inside(row, col):
+         return False
+      return self.tile_matrix[row][col] is not None
+
+   def is_inside(self, row, col):
+      return 0 <= row < self.grid_height and 0 <= col < self.grid_width
+
+   # A method that returns a boolean array of the occupied cells on this board
+   def get_occupied(self):
+      return np.not_equal(self.tile_matrix, None)
+
+   # A method that returns all the columns where the bottom left cell of a
+   # tetromino with the cells at the given offsets (see Rotation.offsets) can
+   # be in a given row, i.e. where its cells are empty and inside the grid (or
+   # above it, as the tetrominoes enter the grid from the top)
+   def fitting_columns(self, offsets, y):
+      return fitting_columns(self.get_occupied(), offsets, y, allow_above=True)
+
+   # A method for computing the height of each column from the occupied cells
+   def update_column_heights(self):
+      self.column_heights = column_heights(self.get_occupied())
+
+   # A method for updating the tile counts and the largest log2 value with the
+   # given log2 values of the tiles that are added to the grid (sign=1) or
+   # removed from the grid (sign=-1), the cost depends on the number of the
+   # given values instead of the area of the grid
+   def update_tile_counts(self, exponents, sign=1):
+      counts = np.bincount(np.ravel(exponents).astype(np.intp),
+                           minlength=Board.n_exponents)
+      counts[0] = 0  # the empty cells are not counted
+      self.tile_counts += sign * counts
+      if sign > 0:
+         added = np.flatnonzero(counts)
+         if len(added) and added[-1] > self.max_exponent:
+            self.max_exponent = int(added[-1])
+      elif self.tile_counts[self.max_exponent] == 0:
+         remaining = np.flatnonzero(self.tile_counts)
+         self.max_exponent = int(remaining[-1]) if len(remaining) else 0
+
+   # A method for counting all the tiles on the grid again (e.g. when the tiles
+   # are restored or set directly)
+   def reset_tile_counts(self):
+      self.tile_counts = np.zeros(Board.n_exponents, dtype=np.int64)
+      self.max_exponent = 0
+      self.update_tile_counts(self.get_values())
+      self.target_reached = self.target_number is not None and \
+         self.has_tile(self.target_number)
+
+   # A method that returns the number of tiles with a given number on the grid
+   def tile_count(self, number):
+      return int(self.tile_counts[number.bit_length() - 1])
+
+   # A method for checking if there is a tile with a given number on the grid
+   def has_tile(self, number):
+      return self.tile_counts[number.bit_length() - 1] > 0
+
+   # A method that returns the largest number on the tiles of the grid (0 if
+   # the grid is empty)
+   def max_tile(self):
+      return 1 << self.max_exponent if self.max_exponent else 0
+
+   # A method that returns the tiles on this board as an integer array of the
+   # log2 values of their numbers (0 for the empty cells)
+   def get_values(self):
+      values = [0 if tile is None else tile.number.bit_length() - 1
+                for tile in self.tile_matrix.flat]
+      return np.array(values, dtype=np.int8).reshape(self.tile_matrix.shape)
+
+   # A method that returns the state of this board (the tiles, the score and
+   # the flags, but not the current tetromino) as a hashable tuple that can be
+   # stored cheaply and given to restore later
+   def snapshot(self):
+      return (self.get_values().tobytes(), self.score, self.game_over,
+              self.lines_cleared, self.tiles_connected)
+
+   # A method for restoring the state of this board from a snapshot (new
+   # tiles are created on the grid with the numbers in the snapshot)
+   def restore(self, snapshot):
+      data, self.score, self.game_over, self.lines_cleared, \
+         self.tiles_connected = snapshot
+      values = np.frombuffer(data, dtype=np.int8)
+      tiles = [None if value == 0 else Tile.with_number(1 << value)
+               for value in values.tolist()]
+      self.tile_matrix = np.array(tiles, dtype=object).reshape(
+         self.grid_height, self.grid_width)
+      self.update_column_heights()
+      self.reset_tile_counts()
+      self.n_updates += 1
+
+   def update_grid(self, tiles_to_lock, blc_position):
+      self.current_tetromino = None
+      self.n_updates += 1
+      locked_cells = self.lock_tiles(tiles_to_lock, blc_position)
+      for row, col in locked_cells:
+         if row >= self.column_heights[col]:
+            self.column_heights[col] = row + 1
+      # the locked tiles are checked before the merges as the other tiles are
+      # not moved if no tiles are merged or cleared (which add to the score)
+      locked_tiles_connected = self.are_connected(locked_cells)
+      score = self.score
+
+      # the log2 values of the tiles are found once for the merges and the
+      # clears (see get_values)
+      values = self.merge_tiles()
+      self.clear_full_rows(values)
+      # 🔥 Yeni: serbest (bağsız) tile'ları temizle (tiles can only become
+      # free when the tiles are moved or the locked tiles are not connected)
+      if self.score != score or not locked_tiles_connected or \
+         not self.tiles_connected:
+         self.remove_free_tiles()
+      if self.target_number is not None and not self.target_reached:
+         self.target_reached = self.has_tile(self.target_number)
+
+      return self.game_over
+
+   # A method for placing the given tiles on the grid (the bottom left cell of
+   # the tile matrix is at the given position), returns the (row, col) cells
+   # of the tiles that are inside the grid
+   def lock_tiles(self, tiles_to_lock, blc_position):
+      locked_cells = []
+      replaced = []  # the log2 values of the tiles that are overwritten
+      n_rows, n_cols = len(tiles_to_lock), len(tiles_to_lock[0])
+      for col in range(n_cols):
+         for row in range(n_rows):
+            if tiles_to_lock[row][col] is not None:
+               pos = Point()
+               pos.x = blc_position.x + col
+               pos.y = blc_position.y + (n_rows - 1) - row
+               if self.is_inside(pos.y, pos.x):
+                  if self.tile_matrix[pos.y][pos.x] is not None:
+                     replaced.append(
+                        self.tile_matrix[pos.y][pos.x].number.bit_length() - 1)
+                  self.tile_matrix[pos.y][pos.x] = tiles_to_lock[row][col]
+                  locked_cells.append((pos.y, pos.x))
+               else:
+                  self.game_over = True
+      self.update_tile_counts([self.tile_matrix[row][col].number.bit_length()
+                               - 1 for row, col in locked_cells])
+      if replaced:
+         self.update_tile_counts(replaced, -1)
+      return locked_cells
+
+   # A method for checking if the tiles in the given cells are connected to the
+   # bottom row, assuming that all the other tiles on the grid are connected
+   # (a tile is connected if it is in the bottom row or it is next to one of
+   # the other tiles or to a connected tile in the given cells)
+   def are_connected(self, cells):
+      cells = set(cells)
+      queue = deque()
+      for row, col in cells:
+         neighbors = ((row - 1, col), (row + 1, col), (row, col - 1),
+                      (row, col + 1))
+         if row == 0 or any(cell not in cells and self.is_occupied(*cell)
+                            for cell in neighbors):
+            queue.append((row, col))
+      connected = set(queue)
+      while queue:
+         row, col = queue.popleft()
+         for cell in ((row - 1, col), (row + 1, col), (row, col - 1),
+                      (row, col + 1)):
+            if cell in cells and cell not in connected:
+               connected.add(cell)
+               queue.append(cell)
+      return len(connected) == len(cells)
+
+   # A method for merging the equal tiles on top of each other (for all the
+   # columns at once, see grid_ops.merge_columns), returns the log2 values of
+   # the tiles after the merges
+   def merge_tiles(self):
+      values = self.get_values()
+      merged_values = values.copy()
+      score, sources = merge_columns(merged_values, return_sources=True)
+      if score == 0:
+         return values  # no tiles are merged
+      self.update_tile_counts(merged_values)
+      self.update_tile_counts(values, -1)
+      values = merged_values
+      # move the tiles to their rows after the merges and update their numbers
+      rows = np.arange(self.grid_height)[:, None]
+      for col in np.flatnonzero(np.any(sources != rows, axis=0)):
+         column = self.tile_matrix[:, col].copy()
+         column = np.where(values[:, col] != 0, column[sources[:, col]], None)
+         for row in np.flatnonzero(values[:, col]):
+            column[row].number = 1 << int(values[row, col])
+         self.tile_matrix[:, col] = column
+      self.score += score  # 🔥 Skora ekle
+      self.update_column_heights()
+      return values
+
+   # A method for clearing all the full rows at once (see also
+   # grid_ops.clear_full_rows), the log2 values of the tiles can be given if
+   # they are known (they are changed), otherwise they are only found when
+   # there are full rows
+   def clear_full_rows(self, values=None):
+      # only the rows below the lowest column height can be full
+      top = int(self.column_heights.min())
+      full = np.not_equal(self.tile_matrix[:top], None).all(axis=1)
+      if not full.any():
+         return  # there are no full rows
+      if values is None:
+         values = self.get_values()
+      self.update_tile_counts(values[:top][full], -1)
+      score, sources = clear_full_rows(values)
+      self.tile_matrix[:] = self.tile_matrix[sources]
+      self.tile_matrix[sources == -1] = None
+      self.score += score  # 🔥 Skora ekle
+      self.lines_cleared += int(np.count_nonzero(sources == -1))
+      self.update_column_heights()
+
+   # 🔻 Yeni: Serbest (bağlantısız) tile'ları sil ve skora ekle
+   # (the connected tiles are found by flood filling the rows of the grid as
+   # bit masks, see grid_ops.connected_cells)
+   def remove_free_tiles(self):
+      occupied = np.not_equal(self.tile_matrix, None)
+      free = occupied & ~connected_cells(occupied)
+      removed = []  # the log2 values of the removed tiles
+      for r, c in zip(*np.nonzero(free)):
+         self.score += self.tile_matrix[r][c].number
+         removed.append(self.tile_matrix[r][c].number.bit_length() - 1)
+         self.tile_matrix[r][c] = None
+      if removed:
+         self.update_tile_counts(removed, -1)
+         self.update_column_heights()
+      self.tiles_connected = True
@@ -0,0 +1,199 @@
+from game_engine import GameEngine  # the game rules without drawing
+from tetromino import Tetromino  # the rotations of the tetrominoes
+from array_board import ArrayBoard  # the compact board used for the search
+from grid_ops import column_heights  # used for the features of the boards
+from collections import OrderedDict  # used for the LRU cache
+import numpy as np  # the fundamental Python module for scientific computing
+import random  # used for the random number generator of the search engine
+
+
+# A class for modeling a bot that plays the game by trying every placement of
+# the current tetromino (and, when holding is allowed, of the tetromino that
+# would be played after a hold, i.e. the held or the next one): each rotation
+# and each column that the tetromino can reach by moving left or right at the
+# top is found on a copy of the game (see GameEngine.snapshot), and the
+# tetromino is dropped and locked at each of them on a copy of the board. The
+# resulting boards (after the merges, the clears and the removal of the free
+# tiles) are scored with a weighted sum of their features. The tetromino is
+# moved down before it is rotated, as a rotation at the top of the grid would
+# move its cells above the grid. The values of the placements are kept in a
+# bounded LRU cache keyed by the board and the position of the tetromino, so
+# a placement that is searched again is not played again
+class PlacementBot:
+   # the default weights of the features of the boards (see board_features,
+   # the score is the score gained with the placement)
+   default_weights = {"score": 1.0, "holes": -40.0, "aggregate_height": -5.0,
+                      "bumpiness": -3.0, "max_height": -10.0}
+
+   # A constructor for creating a bot with the given weights for the features
+   # (the missing ones are 0), whether it can use the hold and the number of
+   # placements kept in its cache
+   def __init__(self, weights=None, use_hold=True, cache_size=100000):
+      self.weights = dict(PlacementBot.default_weights if weights is None
+                          else weights)
+      self.use_hold = use_hold
+      self.cache = LRUCache(cache_size)
+      self.search_engine = None  # the engine used for finding the placements
+      self.plan_key = None  # the state the last actions were chosen for
+
+   # A method that returns the actions (e.g. hold, rotate, left, hard_drop)
+   # for placing the current tetromino of the given game engine at the best
+   # placement (without the tick that locks it)
+   def choose_actions(self, engine):
+      base = engine.snapshot()
+      search_engine = self.get_search_engine(engine)
+      search_engine.restore(base)
+      # the board the placements are locked on (copied for each placement)
+      board = search_engine.grid.copy()
+      board_key = board.tobytes()
+      best_value, best_actions = None, ["hard_drop"]
+      prefixes = [[]]
+      if self.use_hold and engine.can_hold:
+         prefixes.append(["hold"])
+      seen = set()  # the positions that are evaluated
+      for prefix in prefixes:
+         play(search_engine, base, prefix)
+         downs = ["down"] * rotation_clearance(search_engine.current_tetromino)
+         for rotations in range(4):
+            start = prefix + (downs + ["rotate"] * rotations if rotations
+                              else [])
+            for actions, position in self.reachable_moves(search_engine, base,
+                                                          start):
+               # the same position is reached when a rotation is not possible
+               if position in seen:
+                  continue
+               seen.add(position)
+               value = self.evaluate(board, board_key, position)
+               if best_value is None or value > best_value:
+                  best_value, best_actions = value, actions + ["hard_drop"]
+      return best_actions
+
+   # A method that returns all the actions for placing the current tetromino
+   # of the given game engine (so they can be played at once), and no actions
+   # when they are already returned for the tetromino (it is dropped and it is
+   # waiting for the tick that locks it)
+   def next_actions(self, engine):
+      key = (engine.pieces_placed, id(engine.grid))
+      if key == self.plan_key:
+         return []
+      self.plan_key = key
+      return self.choose_actions(engine)
+
+   # A method for forgetting the tetromino the last actions were chosen for
+   # (e.g. when a new game is started), the cached placements are kept
+   def reset(self):
+      self.plan_key = None
+
+   # A method that returns an engine for finding the placements on a copy of
+   # the given game (with its own random number generator, so the pieces of
+   # the game are not changed)
+   def get_search_engine(self, engine):
+      search_engine = self.search_engine
+      if search_engine is None or \
+         search_engine.grid_height != engine.grid_height or \
+         search_engine.grid_width != engine.grid_width:
+         search_engine = GameEngine(engine.grid_height, engine.grid_width,
+                                    board_class=ArrayBoard,
+                                    rng=random.Random(0))
+         self.search_engine = search_engine
+      return search_engine
+
+   # A method that returns the actions for each column that the tetromino can
+   # reach by moving left or right after the given actions, with the position
+   # (the snapshot) of the tetromino after the actions (the reachable columns
+   # are found at once instead of moving the tetromino column by column)
+   def reachable_moves(self, search_engine, base, start):
+      play(search_engine, base, start)
+      tetromino = search_engine.current_tetromino
+      position = tetromino.snapshot()
+      x = tetromino.bottom_left_cell.x
+      left, right = tetromino.get_reachable_columns(search_engine.grid)
+      moves = [(start, position)]
+      for column in list(range(x - 1, left - 1, -1)) + \
+         list(range(x + 1, right + 1)):
+         direction = "left" if column < x else "right"
+         moves.append((start + [direction] * abs(column - x),
+                       position[:2] + (column,) + position[3:]))
+      return moves
+
+   # A method that returns the value of dropping and locking a tetromino at
+   # the given position on a copy of the given board (whose tobytes are given
+   # as its key), the value is looked up in the cache before the tetromino is
+   # locked
+   def evaluate(self, board, board_key, position):
+      key = (board_key, position)
+      value = self.cache.get(key)
+      if value is not None:
+         return value
+      placed = board.copy()
+      tetromino = Tetromino.from_snapshot(position)
+      tetromino.hard_drop(placed)
+      game_over = placed.update_grid(
+         *tetromino.get_min_bounded_tile_matrix(True))
+      if game_over and not placed.has_tile(GameEngine.win_number):
+         value = float("-inf")  # the game is lost with this placement
+      else:
+         features = board_features(placed.get_values())
+         features["score"] = placed.score - board.score
+         value = sum(self.weights.get(name, 0) * feature
+                     for name, feature in features.items())
+      self.cache.put(key, value)
+      return value
+
+
+# A function for playing the given actions on a game engine after restoring
+# the game with the given snapshot
+def play(engine, snapshot, actions):
+   engine.restore(snapshot)
+   for action in actions:
+      engine.step(action)
+
+
+# A function that returns the number of rows a tetromino at the top of the grid
+# must be moved down so that all its rotations are inside the grid
+def rotation_clearance(tetromino):
+   return max(dy for rotation in Tetromino.rotations[tetromino.type]
+              for _, dy in rotation.offsets)
+
+
+# A function that returns the features of a board with the given log2 values
+# of the tiles: the number of empty cells below the top of their columns
+# (holes), the sum and the maximum of the column heights and the sum of the
+# height differences of the neighboring columns (bumpiness)
+def board_features(values):
+   occupied = values != 0
+   heights = column_heights(occupied)
+   aggregate_height = int(heights.sum())
+   return {"holes": aggregate_height - int(np.count_nonzero(occupied)),
+           "aggregate_height": aggregate_height,
+           "bumpiness": int(np.abs(np.diff(heights)).sum()),
+           "max_height": int(heights.max())}
+
+
+# A class for modeling a bounded cache that drops the least recently used
+# entries when it is full
+class LRUCache:
+   def __init__(self, max_size):
+      self.max_size = max_size
+      self.entries = OrderedDict()
+      self.hits, self.misses = 0, 0
+
+   # A method that returns the value for a given key (None if it is missing)
+   def get(self, key):
+      value = self.entries.get(key)
+      if value is None:
+         self.misses += 1
+         return None
+      self.entries.move_to_end(key)
+      self.hits += 1
+      return value
+
+   # A method for adding a value for a given key to the cache
+   def put(self, key, value):
+      self.entries[key] = value
+      self.entries.move_to_end(key)
+      if len(self.entries) > self.max_size:
+         self.entries.popitem(last=False)
+
+   def __len__(self):
+      return len(self.entries)
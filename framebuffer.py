@@ -0,0 +1,279 @@
+from game_engine import GameEngine  # the game rules without drawing
+from replay import ReplayLog, replay_engine  # the recorded games
+import numpy as np  # the fundamental Python module for scientific computing
+import argparse  # used for the command line options
+import json  # used for printing the number of the rendered frames
+import os  # used for the paths of the frames
+import struct  # used for the chunks of the PNG files
+import zlib  # used for compressing the PNG files
+
+# the colors (RGB) of the frames, the same as the colors used by GameGrid,
+# TileStyle and the side panel when the game is drawn with stddraw
+empty_cell_color = (42, 69, 99)
+line_color = (0, 100, 200)
+tile_color, label_color, box_color = (151, 178, 199), (0, 100, 200), \
+   (0, 100, 200)
+ghost_color, ghost_box_color = (200, 200, 200), (150, 150, 150)  # gri
+panel_color, text_color = (255, 0, 0), (255, 255, 255)
+
+# the digits as bitmaps of 3x5 pixels (used for the labels of the tiles and
+# for the score, as there is no font renderer without the drawing stack)
+digit_bitmaps = {
+   "0": ("111", "101", "101", "101", "111"),
+   "1": ("010", "110", "010", "010", "111"),
+   "2": ("111", "001", "111", "100", "111"),
+   "3": ("111", "001", "111", "001", "111"),
+   "4": ("101", "101", "111", "001", "001"),
+   "5": ("111", "100", "111", "001", "111"),
+   "6": ("111", "100", "111", "101", "111"),
+   "7": ("111", "001", "010", "010", "010"),
+   "8": ("111", "101", "111", "101", "111"),
+   "9": ("111", "101", "111", "001", "111"),
+}
+
+
+# A class for drawing the game offscreen into (height, width, 3) uint8 RGB
+# arrays (frames) instead of a window: each tile number is drawn once as a
+# sprite of a cell (the background, the box and the label) and a frame is
+# made by indexing the sprites with the log2 values of the grid, so drawing a
+# frame costs a few NumPy operations instead of a draw call for each cell. The
+# frames have the same layout as the window (the grid with a side panel of 6
+# cells that shows the score and the next and the held tetrominoes)
+class FrameRenderer:
+   panel_cells = 6  # the width of the side panel in cells
+   # the sprites of the numbers up to 2^17 are drawn in advance (the sprites
+   # of larger numbers are added when they are first needed)
+   precomputed_exponents = 17
+
+   # A constructor for creating a renderer for a grid with given dimensions
+   # where each cell is drawn as a square of cell_size pixels
+   def __init__(self, grid_h, grid_w, cell_size=24, panel=True):
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.cell_size = cell_size
+      self.panel = panel
+      width = grid_w + (FrameRenderer.panel_cells if panel else 0)
+      # the frame is drawn into the same array each time
+      self.frame = np.zeros((grid_h * cell_size, width * cell_size, 3),
+                            dtype=np.uint8)
+      # the cells of the grid in the frame as (row, y, col, x, rgb), where the
+      # first row is the top row of the frame (the view fails if a copy is
+      # needed, so the cells are always drawn into the frame)
+      self.cells = self.frame[:, :grid_w * cell_size].view()
+      self.cells.shape = (grid_h, cell_size, grid_w, cell_size, 3)
+      self.sprites = np.stack(
+         [self.cell_sprite(exponent)
+          for exponent in range(FrameRenderer.precomputed_exponents + 1)])
+      self.ghost_sprite = self.cell_sprite(None, ghost=True)
+      self.panel_key = None  # what is drawn on the panel of the frame
+
+   # A method that returns the sprite of a cell with a tile with a given log2
+   # value (0 for an empty cell, None for a ghost tile) as a (cell_size,
+   # cell_size, 3) array
+   def cell_sprite(self, exponent, ghost=False):
+      size = self.cell_size
+      sprite = np.empty((size, size, 3), dtype=np.uint8)
+      if exponent == 0:
+         # an empty cell with the grid lines on its top and left sides (the
+         # lines of the other sides are drawn by the neighboring cells)
+         sprite[:] = empty_cell_color
+         sprite[0, :] = sprite[:, 0] = line_color
+         return sprite
+      sprite[:] = ghost_color if ghost else tile_color
+      box = ghost_box_color if ghost else box_color
+      sprite[[0, -1], :] = sprite[:, [0, -1]] = box
+      if not ghost:
+         label = text_bitmap(str(1 << exponent))
+         # the largest scale that fits the label into the cell with a margin
+         scale = max(1, min((size - 4) // label.shape[1],
+                            (size // 2) // label.shape[0]))
+         draw_bitmap(sprite, label, scale, label_color, center=True)
+      return sprite
+
+   # A method that returns the sprites of all the log2 values up to a given
+   # value (the missing sprites are drawn and added)
+   def sprites_up_to(self, max_exponent):
+      n_sprites = len(self.sprites)
+      if max_exponent >= n_sprites:
+         added = [self.cell_sprite(exponent)
+                  for exponent in range(n_sprites, max_exponent + 1)]
+         self.sprites = np.concatenate([self.sprites, np.stack(added)])
+      return self.sprites
+
+   # A method for drawing a frame with the tiles with the given log2 values
+   # (row 0 at the bottom as on the grid), the given tetromino with its ghost
+   # (if a board is given for finding the ghost), the score and the next and
+   # the held tetrominoes on the panel. Returns the frame, which is drawn
+   # again by the next call (it must be copied to be kept)
+   def render(self, values, tetromino=None, board=None, score=0,
+              next_tetromino=None, held_tetromino=None):
+      sprites = self.sprites_up_to(int(values.max()))
+      self.cells[:] = sprites[values[::-1]].transpose(0, 2, 1, 3, 4)
+      if tetromino is not None:
+         if board is not None:
+            ghost = tetromino.get_ghost_copy(board)
+            self.draw_tetromino(ghost, self.ghost_sprite)
+         self.draw_tetromino(tetromino)
+      if self.panel:
+         self.draw_panel(score, next_tetromino, held_tetromino)
+      return self.frame
+
+   # A method for drawing the frame of a game run by a GameEngine
+   def render_engine(self, engine):
+      current = None if engine.done else engine.current_tetromino
+      return self.render(engine.grid.get_values(), current, engine.grid,
+                         engine.score, engine.next_tetromino,
+                         engine.held_tetromino)
+
+   # A method for drawing the tiles of a tetromino that are inside the grid
+   # (each with the sprite of its number or with a given sprite)
+   def draw_tetromino(self, tetromino, sprite=None):
+      position = tetromino.bottom_left_cell
+      for (dx, dy), tile in zip(tetromino.current_rotation.offsets,
+                                tetromino.tiles):
+         row, col = position.y + dy, position.x + dx
+         if 0 <= row < self.grid_height and 0 <= col < self.grid_width:
+            self.cells[self.grid_height - 1 - row, :, col] = \
+               self.tile_sprite(tile.number) if sprite is None else sprite
+
+   # A method that returns the sprite of the tiles with a given number, laid
+   # out as the cells of the frame (y, x, rgb)
+   def tile_sprite(self, number):
+      exponent = number.bit_length() - 1
+      return self.sprites_up_to(exponent)[exponent]
+
+   # A method for drawing the side panel with the score and the previews of
+   # the next and the held tetrominoes (at the same rows as in the window)
+   # (the panel is only drawn again when the score or the tetrominoes change,
+   # as the grid is drawn without touching it)
+   def draw_panel(self, score, next_tetromino, held_tetromino):
+      panel_key = (score, next_tetromino, held_tetromino,
+                   next_tetromino and next_tetromino.rotation,
+                   held_tetromino and held_tetromino.rotation)
+      if panel_key == self.panel_key:
+         return
+      self.panel_key = panel_key
+      size = self.cell_size
+      panel = self.frame[:, self.grid_width * size:]
+      panel[:] = panel_color
+      score_bitmap = text_bitmap(str(score))
+      scale = max(1, min(size // 8, (panel.shape[1] - size) //
+                         score_bitmap.shape[1]))
+      draw_bitmap(panel[size // 2:, size // 2:], score_bitmap, scale,
+                  text_color)
+      for tetromino, top in ((next_tetromino, 4), (held_tetromino, 10)):
+         if tetromino is not None:
+            self.draw_preview(panel, tetromino, top * size, size)
+
+   # A method for drawing a tetromino (its minimal bounded tile matrix) on the
+   # panel with its top left cell at the given pixels, the cells outside the
+   # panel are not drawn
+   def draw_preview(self, panel, tetromino, top, left):
+      size = self.cell_size
+      matrix = tetromino.get_min_bounded_tile_matrix()
+      for row, tiles in enumerate(matrix):
+         for col, tile in enumerate(tiles):
+            y, x = top + row * size, left + col * size
+            if tile is not None and y + size <= panel.shape[0] and \
+               x + size <= panel.shape[1]:
+               panel[y:y + size, x:x + size] = self.tile_sprite(tile.number)
+
+
+# A function that returns a text of digits as a boolean bitmap (5 rows, 4
+# columns per digit with a column of space between the digits)
+def text_bitmap(text):
+   rows = [" ".join(digit_bitmaps[digit][row] for digit in text)
+           for row in range(5)]
+   return np.array([[pixel == "1" for pixel in row] for row in rows])
+
+
+# A function for drawing a bitmap scaled by a given factor with a given color
+# on an image, at the top left corner or at the center of the image (the
+# pixels outside the image are not drawn)
+def draw_bitmap(image, bitmap, scale, color, center=False):
+   mask = np.kron(bitmap, np.ones((scale, scale), dtype=bool))
+   top, left = 0, 0
+   if center:
+      top = (image.shape[0] - mask.shape[0]) // 2
+      left = (image.shape[1] - mask.shape[1]) // 2
+   # the parts of a bitmap larger than the image are cut off (evenly on both
+   # sides when it is centered)
+   mask = mask[max(0, -top):, max(0, -left):]
+   top, left = max(0, top), max(0, left)
+   mask = mask[:image.shape[0] - top, :image.shape[1] - left]
+   region = image[top:top + mask.shape[0], left:left + mask.shape[1]]
+   region[mask] = color
+
+
+# A function for saving a frame as a PNG file (compressed with a given zlib
+# level, the fastest by default)
+def write_png(path, frame, level=1):
+   height, width, _ = frame.shape
+   rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # filter type 0
+   rows[:, 1:] = frame.reshape(height, width * 3)
+
+   def chunk(kind, data):
+      return struct.pack(">I", len(data)) + kind + data + \
+         struct.pack(">I", zlib.crc32(kind + data))
+
+   header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # RGB
+   with open(path, "wb") as file:
+      file.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+                 chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) +
+                 chunk(b"IEND", b""))
+
+
+# A generator that replays the actions in a given replay log (as
+# replay.replay) and yields the frames drawn by a given FrameRenderer: the
+# first frame, a frame after every given number of actions and the last frame
+def replay_frames(log, renderer, every=1):
+   engine = replay_engine(log)
+   yield renderer.render_engine(engine)
+   for index, action in enumerate(log.actions, 1):
+      engine.step(GameEngine.actions[action])
+      if index % every == 0 or index == len(log.actions):
+         yield renderer.render_engine(engine)
+
+
+# A function for drawing the frames of a replay log from the command line, e.g.
+# python framebuffer.py replays/game.t2r --frames frames --every 10
+# (the frames can be saved as PNG files, as raw RGB video that can be encoded
+# with ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH, and the last frame as a
+# thumbnail)
+def main():
+   parser = argparse.ArgumentParser(
+      description="Draw the frames of a replay log without a display")
+   parser.add_argument("log", help="a replay log (see replay.py)")
+   parser.add_argument("--frames", help="a directory for the PNG frames")
+   parser.add_argument("--video", help="a file for the frames as raw RGB")
+   parser.add_argument("--thumbnail", help="a PNG file for the last frame")
+   parser.add_argument("--every", type=int, default=1,
+                       help="draw a frame after this many actions")
+   parser.add_argument("--cell-size", type=int, default=24)
+   args = parser.parse_args()
+
+   log = ReplayLog.load(args.log)
+   renderer = FrameRenderer(log.grid_height, log.grid_width, args.cell_size)
+   if args.frames:
+      os.makedirs(args.frames, exist_ok=True)
+   video = open(args.video, "wb") if args.video else None
+   n_frames = 0
+   try:
+      for frame in replay_frames(log, renderer, args.every):
+         if args.frames:
+            write_png(os.path.join(args.frames, f"frame-{n_frames:06d}.png"),
+                      frame)
+         if video is not None:
+            video.write(frame.tobytes())
+         n_frames += 1
+   finally:
+      if video is not None:
+         video.close()
+   if args.thumbnail:
+      write_png(args.thumbnail, renderer.frame)
+   height, width, _ = renderer.frame.shape
+   print(json.dumps({"frames": n_frames, "width": width, "height": height}))
+
+
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,165 @@
+from board import Board  # the game rules without any drawing
+from tetromino import Tetromino, create_tetromino  # the falling pieces
+import random  # the default random number generator of the game
+
+
+# A class for running the game without any drawing, keyboard polling or wall
+# clock time: the game only advances when the step method is called with an
+# action, which makes it possible to simulate games as fast as the rules run
+class GameEngine:
+   # the actions that can be given to the step method
+   actions = ("left", "right", "down", "rotate", "hard_drop", "hold", "tick")
+   # the game is won when a tile with this number is created
+   win_number = 2048
+
+   # A constructor for creating a game on a grid with given dimensions (any
+   # class with the Board interface can be used for the grid, e.g. GameGrid),
+   # the pieces are created with the given random number generator (e.g. a
+   # seeded random.Random, the random module by default) or taken from the
+   # given PieceQueue (which then also gives the lookahead of the pieces)
+   def __init__(self, grid_h=20, grid_w=12, board_class=Board, rng=None,
+                pieces=None):
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.board_class = board_class
+      self.rng = random if rng is None else rng
+      self.pieces = pieces
+      self.reset()
+
+   # A method for starting a new game on an empty grid
+   def reset(self):
+      self.grid = self.board_class(self.grid_height, self.grid_width)
+      self.grid.target_number = self.win_number
+      self.current_tetromino = self.new_tetromino()
+      self.next_tetromino = self.new_tetromino()
+      self.held_tetromino = None
+      self.can_hold = True
+      self.grid.current_tetromino = self.current_tetromino
+      self.pieces_placed = 0
+      self.won = False  # a tile with win_number is created
+      self.done = False  # the game is over (won or lost)
+
+   @property
+   def score(self):
+      return self.grid.score
+
+   # A method that returns the state of the game (the grid, the tetrominoes,
+   # the counters and the state of the pieces, i.e. of the random number
+   # generator or of the piece queue) as a hashable tuple, which can be used
+   # for undoing moves, rewinding the game or searching the moves
+   def snapshot(self):
+      held = self.held_tetromino
+      return (self.grid.snapshot(), self.current_tetromino.snapshot(),
+              self.next_tetromino.snapshot(),
+              None if held is None else held.snapshot(), self.can_hold,
+              self.pieces_placed, self.won, self.done, self.pieces_snapshot())
+
+   # A method for restoring the state of the game from a snapshot (the state
+   # of the pieces is only restored when the snapshot is taken from a game
+   # that draws its pieces in the same way, e.g. an engine with its own random
+   # number generator keeps drawing its own pieces)
+   def restore(self, snapshot):
+      grid, current, upcoming, held, self.can_hold, self.pieces_placed, \
+         self.won, self.done, pieces = snapshot
+      self.grid.restore(grid)
+      self.current_tetromino = Tetromino.from_snapshot(current)
+      self.next_tetromino = Tetromino.from_snapshot(upcoming)
+      self.held_tetromino = None if held is None else \
+         Tetromino.from_snapshot(held)
+      self.grid.current_tetromino = self.current_tetromino
+      source, state = pieces
+      if source == "queue" and self.pieces is not None:
+         self.pieces.restore(state)
+      elif source == "rng" and self.pieces is None:
+         self.rng.setstate(state)
+
+   # A method that returns the state of the source of the pieces as a tagged
+   # tuple (the position of the piece queue or the state of the generator)
+   def pieces_snapshot(self):
+      if self.pieces is not None:
+         return ("queue", self.pieces.snapshot())
+      return ("rng", self.rng.getstate())
+
+   # A method for applying a single action to the game, returns True when the
+   # action locked the current tetromino on the grid
+   # (hard_drop moves the tetromino down as far as possible and, as in the
+   # interactive game, the tetromino is locked by the following tick)
+   def step(self, action):
+      if self.done:
+         return False
+      if action == "left" or action == "right" or action == "down":
+         self.current_tetromino.move(action, self.grid)
+      elif action == "hard_drop":
+         self.current_tetromino.hard_drop(self.grid)
+      elif action == "rotate":
+         self.current_tetromino.rotate(self.grid)
+      elif action == "hold":
+         self.hold()
+      elif action == "tick":
+         return self.tick()
+      else:
+         raise ValueError(f"Unsupported action: {action}")
+      return False
+
+   # A method for swapping the current tetromino with the held one (allowed
+   # once for each tetromino that is locked)
+   def hold(self):
+      if not self.can_hold:
+         return
+      if self.held_tetromino is None:
+         self.held_tetromino = self.current_tetromino
+         self.current_tetromino = self.next_tetromino
+         self.next_tetromino = self.new_tetromino()
+      else:
+         self.held_tetromino, self.current_tetromino = \
+            self.current_tetromino, self.held_tetromino
+         self.held_tetromino.bottom_left_cell.y = self.grid_height - 1
+      self.grid.current_tetromino = self.current_tetromino
+      self.can_hold = False
+
+   # A method for moving the current tetromino down by gravity, the tetromino
+   # is locked on the grid (and the next one is spawned) when it cannot move
+   def tick(self):
+      if self.current_tetromino.move("down", self.grid):
+         return False
+      tiles, pos = self.current_tetromino.get_min_bounded_tile_matrix(True)
+      game_over = self.grid.update_grid(tiles, pos)
+      self.pieces_placed += 1
+
+      if self.has_winning_tile():
+         self.won = True
+         self.done = True
+      elif game_over:
+         self.done = True
+      else:
+         self.current_tetromino = self.next_tetromino
+         self.next_tetromino = self.new_tetromino()
+         self.grid.current_tetromino = self.current_tetromino
+         self.can_hold = True
+      return True
+
+   # A method that returns a new tetromino for the next piece at the top of
+   # the grid (created with the random number generator or taken from the
+   # piece queue)
+   def new_tetromino(self):
+      if self.pieces is None:
+         return create_tetromino(self.grid_height, self.grid_width, self.rng)
+      return self.pieces.pop(self.grid_height - 1)
+
+   # A method that returns the types of the n pieces after the next tetromino
+   # (only known when the pieces are taken from a PieceQueue, otherwise none
+   # are returned)
+   def upcoming_types(self, n):
+      if self.pieces is None:
+         return []
+      return self.pieces.peek_types(n)
+
+   # A method that returns the largest number on the tiles of the grid (0 if
+   # the grid is empty, see Board.max_tile)
+   def max_tile(self):
+      return self.grid.max_tile()
+
+   # A method for checking if any tile on the grid has the winning number
+   # (from the tile counts of the grid instead of scanning the grid)
+   def has_winning_tile(self):
+      return bool(self.grid.has_tile(self.win_number))
@@ -0,0 +1,311 @@
+import numpy as np  # the fundamental Python module for scientific computing
+
+# Functions that apply the rules of the game to the cells of a game grid given
+# as an integer array of log2 tile values (0 for the empty cells, 1 for 2, 2 for
+# 4 and so on, as in ArrayBoard). Each function works on a single grid with the
+# shape (h, w) as well as on a batch of grids with the shape (n, h, w), and the
+# given array is updated in place.
+
+
+# A function that returns the sum of the numbers on the tiles with the given
+# log2 values (the empty cells are skipped), over the given axis if any
+def sum_numbers(exponents, axis=None):
+   exponents = np.asarray(exponents, dtype=np.int64)
+   numbers = np.left_shift(1, exponents)
+   return np.sum(np.where(exponents != 0, numbers, 0), axis=axis)
+
+
+# the largest number of cells in the columns with pairs of tiles that are merged
+# one by one by merge_columns (see merge_column)
+small_merge_cells = 64
+
+
+# A function that merges the equal tiles on top of each other in all the columns
+# at once with the rule of the game: scanning each column upwards, a tile
+# absorbs the tiles with the same number right above it (doubling each time)
+# and the rest of the column is shifted down by one cell for each merge.
+# Returns the score gained (per grid for a batch) and, when return_sources is
+# set, the row where the tile now in each cell was before the merge (or -1)
+def merge_columns(values, return_sources=False):
+   h, w = values.shape[-2:]
+   grids = _grids_of(values)
+   scores = np.zeros(len(grids), dtype=np.int64)
+   sources = None
+   if return_sources:
+      sources = np.repeat(np.arange(h)[:, None], w, axis=1)
+      sources = np.broadcast_to(sources, grids.shape).copy()
+
+   # the cells that have a tile with the same number right above them
+   pairs = (grids[:, :-1] == grids[:, 1:]) & (grids[:, :-1] != 0)
+   if not pairs.any():
+      return _scores_for(values, scores), _sources_for(values, sources)
+
+   # the columns (of all the grids) that contain at least one pair of tiles
+   grid_ind, col_ind = np.nonzero(pairs.any(axis=1))
+   columns = grids[grid_ind, :, col_ind].astype(np.int64)  # shape: (k, h)
+   k = len(columns)
+   if k * h <= small_merge_cells:
+      # a few short columns are merged one by one (the array operations
+      # below cost more than a loop over a few cells)
+      for i, column in enumerate(columns.tolist()):
+         merged, merged_sources, gained = merge_column(column)
+         grids[grid_ind[i], :, col_ind[i]] = merged
+         scores[grid_ind[i]] += gained
+         if return_sources:
+            sources[grid_ind[i], :, col_ind[i]] = merged_sources
+      return _scores_for(values, scores), _sources_for(values, sources)
+
+   # A tile that absorbs the tile above it becomes one step larger than that
+   # tile, so a tile is absorbed by the tile below it when either
+   # - the tile below is not absorbed and has the same number (equal), or
+   # - the tile below is absorbed and has half of its number (double).
+   # Any other tile is not absorbed, so the absorbed tiles in each column are
+   # the ones with an odd number of equal tiles since the last such tile.
+   step = np.empty_like(columns)
+   step[:, 0] = -1  # the tiles in the bottom row are never absorbed
+   np.subtract(columns[:, 1:], columns[:, :-1], out=step[:, 1:])
+   occupied = columns != 0
+   equal = occupied & (step == 0)
+   reset = ~(equal | (occupied & (step == 1)))
+   last_reset = np.maximum.accumulate(reset * np.arange(h), axis=1)
+   n_equal = np.cumsum(equal, axis=1)
+   n_equal -= n_equal[np.arange(k)[:, None], last_reset]
+   kept = n_equal % 2 == 0
+
+   # each tile that is not absorbed is doubled for each tile it absorbs (the
+   # absorbed tiles are the ones up to the next tile that is kept) and it is
+   # moved down by one cell for each absorbed tile below it
+   kept_col, kept_row = np.nonzero(kept)
+   kept_cells = kept_col * h + kept_row
+   absorbed_counts = np.empty_like(kept_cells)
+   absorbed_counts[:-1] = kept_cells[1:] - kept_cells[:-1] - 1
+   absorbed_counts[-1] = k * h - kept_cells[-1] - 1
+   new_row = np.cumsum(kept, axis=1)[kept_col, kept_row] - 1
+   kept_values = columns[kept_col, kept_row]
+   merged = np.zeros((k, h), dtype=values.dtype)
+   merged[kept_col, new_row] = kept_values + absorbed_counts
+   # the score for doubling a tile with the number 2^v m times is
+   # 2^(v+1) + ... + 2^(v+m) = 2^(v+1) * (2^m - 1)
+   gained = np.left_shift(1, kept_values + 1) * \
+      (np.left_shift(1, absorbed_counts) - 1)
+
+   grids[grid_ind, :, col_ind] = merged
+   np.add.at(scores, grid_ind[kept_col], gained)
+   if return_sources:
+      merged_sources = np.full((k, h), -1)
+      merged_sources[kept_col, new_row] = kept_row
+      sources[grid_ind, :, col_ind] = merged_sources
+   return _scores_for(values, scores), _sources_for(values, sources)
+
+
+# A function that merges the equal tiles on top of each other in a single column
+# given as a list of log2 values (from the bottom) with the same rule as
+# merge_columns: a tile absorbs the equal tiles that come right above it, and
+# the tiles that are not absorbed (and the empty cells) keep their order.
+# Returns the log2 values after the merges, the row where each of them was
+# before (-1 for the empty cells added to the top) and the score gained
+def merge_column(column):
+   merged, sources, score = [], [], 0
+   for row, value in enumerate(column):
+      if value and merged and merged[-1] == value:
+         merged[-1] += 1  # the top tile absorbs this tile
+         score += 1 << merged[-1]
+      else:
+         merged.append(value)
+         sources.append(row)
+   n_absorbed = len(column) - len(merged)
+   return merged + [0] * n_absorbed, sources + [-1] * n_absorbed, score
+
+
+# A function that clears all the full rows at once with the rule of the game:
+# the numbers on the tiles in the full rows are added to the score and the
+# other rows are moved down to fill the gaps (in their order). Returns the
+# score gained (per grid for a batch) and the row where each row was before the
+# rows are cleared (-1 for the empty rows added to the top)
+def clear_full_rows(values):
+   h, w = values.shape[-2:]
+   grids = _grids_of(values)
+   full = np.all(grids != 0, axis=2)  # shape: (n, h)
+   scores = np.zeros(len(grids), dtype=np.int64)
+   sources = np.broadcast_to(np.arange(h), full.shape)
+   # only the grids with full rows are changed
+   changed = np.flatnonzero(full.any(axis=1))
+   if len(changed) == 0:
+      return _scores_for(values, scores), sources.reshape(values.shape[:-1])
+   full, changed_grids = full[changed], grids[changed]
+   scores[changed] = sum_numbers(np.where(full[:, :, None], changed_grids, 0),
+                                 axis=(1, 2))
+   # a stable sort moves the rows that are not full to the bottom in order
+   changed_sources = np.argsort(full, axis=1, kind="stable")
+   changed_grids = np.take_along_axis(changed_grids,
+                                      changed_sources[:, :, None], axis=1)
+   cleared = np.arange(h) >= h - full.sum(axis=1, keepdims=True)
+   changed_grids[cleared] = 0
+   changed_sources[cleared] = -1
+   grids[changed] = changed_grids
+   sources = sources.copy()
+   sources[changed] = changed_sources
+   return _scores_for(values, scores), sources.reshape(values.shape[:-1])
+
+
+# A function that returns the height of each column, i.e. the row above the
+# highest occupied cell in the column (0 for the empty columns), for the given
+# boolean array of occupied cells (of a single grid or a batch of grids)
+def column_heights(occupied):
+   h = occupied.shape[-2]
+   top = h - np.argmax(occupied[..., ::-1, :], axis=-2)
+   return np.where(occupied.any(axis=-2), top, 0)
+
+
+# A function that returns all the columns x where a piece with the cells at the
+# given offsets (dx, dy) from its bottom left cell (x, y) fits in the row y of
+# a grid with the given occupied cells (a boolean array with the shape (h, w)),
+# i.e. where all its cells are inside the grid (or above the grid when
+# allow_above is set) and empty. The columns are tested at once by AND-ing a
+# slice of each row of the grid for each cell of the piece
+def fitting_columns(occupied, offsets, y, allow_above=False):
+   h, w = occupied.shape
+   min_dx = min(dx for dx, _ in offsets)
+   max_dx = max(dx for dx, _ in offsets)
+   n = w - (max_dx - min_dx)  # the number of columns with the piece inside
+   if n <= 0:
+      return np.empty(0, dtype=int)
+   fits = np.ones(n, dtype=bool)
+   for dx, dy in offsets:
+      row = y + dy
+      if row < 0 or (row >= h and not allow_above):
+         return np.empty(0, dtype=int)
+      if row < h:
+         start = dx - min_dx
+         fits &= ~occupied[row, start:start + n]
+   return np.flatnonzero(fits) - min_dx
+
+
+# A function that returns which of the occupied cells (given as a boolean array
+# with the shape (h, w)) are connected to the bottom row through the occupied
+# cells on their left, right, top and bottom, i.e. the cells that are not free
+# (see connected_cells_batch for a batch of grids)
+def connected_cells(occupied):
+   if occupied.ndim == 3:
+      return connected_cells_batch(occupied)
+   h, w = occupied.shape
+   masks = row_masks(occupied)
+   # only the rows up to the highest occupied row are flood filled
+   top = h
+   while top > 0 and not masks[top - 1]:
+      top -= 1
+   reached = [0] * top
+   if top == 0:
+      return np.zeros((h, w), dtype=bool)
+   # flood fill the rows with alternating upward and downward sweeps, each row
+   # is reached from the reached cells right below or above it, until the
+   # downward sweep does not reach any new cells
+   reached[0] = masks[0]
+   while True:
+      for row in range(1, top):
+         seed = reached[row] | (reached[row - 1] & masks[row])
+         if seed != reached[row]:
+            reached[row] = fill_row(seed, masks[row], w)
+      changed = False
+      for row in range(top - 2, -1, -1):
+         seed = reached[row] | (reached[row + 1] & masks[row])
+         if seed != reached[row]:
+            reached[row] = fill_row(seed, masks[row], w)
+            changed = True
+      if not changed:
+         break
+   connected = np.zeros((h, w), dtype=bool)
+   connected[:top] = mask_rows(reached, w)
+   return connected
+
+
+# A function that returns the connected cells (see connected_cells) of a batch
+# of grids given as a boolean array with the shape (n, h, w), the rows of all
+# the grids are flood filled at once as arrays of bit masks
+def connected_cells_batch(occupied):
+   n, h, w = occupied.shape
+   if w >= 63:  # the rows do not fit in 64-bit integers
+      return np.array([connected_cells(grid) for grid in occupied],
+                      dtype=bool).reshape(n, h, w)
+   weights = np.left_shift(1, np.arange(w, dtype=np.int64))
+   masks = occupied.astype(np.int64) @ weights  # shape: (n, h)
+   reached = np.zeros_like(masks)
+   reached[:, 0] = masks[:, 0]
+   # only the rows up to the highest occupied row of all the grids are filled
+   occupied_rows = np.flatnonzero(masks.any(axis=0))
+   top = occupied_rows[-1] + 1 if len(occupied_rows) else 0
+   while True:
+      for row in range(1, top):
+         seed = reached[:, row] | (reached[:, row - 1] & masks[:, row])
+         reached[:, row] = fill_row(seed, masks[:, row], w)
+      changed = False
+      for row in range(top - 2, -1, -1):
+         seed = reached[:, row] | (reached[:, row + 1] & masks[:, row])
+         if np.any(seed != reached[:, row]):
+            reached[:, row] = fill_row(seed, masks[:, row], w)
+            changed = True
+      if not changed:
+         break
+   return (np.right_shift(reached[:, :, None], np.arange(w)) & 1).astype(bool)
+
+
+# A function that returns the cells of a row that are reached from the given
+# seed cells by moving left or right over the occupied cells (mask), where each
+# row is given as an integer with the bit c set for the cell in column c
+# (the fill doubles the distance in each step as in Kogge-Stone adders), the
+# rows can also be given as integer arrays for filling many rows at once
+def fill_row(seed, mask, w):
+   left, right, shift = mask, mask, 1
+   while shift < w:
+      seed = seed | left & (seed << shift) | right & (seed >> shift)
+      left = left & (left << shift)
+      right = right & (right >> shift)
+      shift *= 2
+   return seed
+
+
+# A function that converts the rows of a boolean array to integers with the bit
+# c set for the cell in column c (see also mask_rows)
+def row_masks(occupied):
+   w = occupied.shape[1]
+   if w < 63:
+      weights = np.left_shift(1, np.arange(w, dtype=np.int64))
+      return (occupied.astype(np.int64) @ weights).tolist()
+   packed = np.packbits(occupied, axis=1, bitorder="little")
+   return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+
+# A function that converts the integers returned by row_masks back to a boolean
+# array with the given number of columns
+def mask_rows(masks, w):
+   if w < 63:
+      masks = np.array(masks, dtype=np.int64)[:, None]
+      return (np.right_shift(masks, np.arange(w)) & 1).astype(bool)
+   n_bytes = (w + 7) // 8
+   packed = np.frombuffer(b"".join(mask.to_bytes(n_bytes, "little")
+                                   for mask in masks), dtype=np.uint8)
+   return np.unpackbits(packed.reshape(len(masks), n_bytes), axis=1,
+                        count=w, bitorder="little").astype(bool)
+
+
+# A helper function that returns the given values as a (n, h, w) view
+def _grids_of(values):
+   if not values.flags.c_contiguous:
+      raise ValueError("The values of the grids must be a contiguous array")
+   # (the number of grids is given, as -1 cannot be used for empty grids)
+   n_grids = int(np.prod(values.shape[:-2], dtype=np.int64))
+   return values.reshape((n_grids,) + values.shape[-2:])
+
+
+# Helper functions for returning the results of the functions above in the
+# shape of the given values (a single grid or a batch of grids)
+def _scores_for(values, scores):
+   if values.ndim == 2:
+      return int(scores[0])
+   return scores.reshape(values.shape[:-2])
+
+
+def _sources_for(values, sources):
+   if sources is None:
+      return None
+   return sources.reshape(values.shape)
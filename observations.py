@@ -0,0 +1,161 @@
+from game_engine import GameEngine  # the game rules without drawing
+from array_board import ArrayBoard  # the board that keeps the features
+from self_play import make_policy, make_piece_queue  # as in self-play games
+from piece_queue import PieceQueue  # the distributions of the pieces
+from tetromino import Tetromino  # the types of the pieces
+import numpy as np  # the fundamental Python module for scientific computing
+import argparse  # used for the command line options
+import json  # used for printing the number of the written observations
+import os  # used for the paths of the shards
+import random  # used for the seeded random number generators
+
+# the types of the pieces (the index of each type is used as its id, as in
+# BatchEngine, -1 is used when there is no held piece)
+piece_types = tuple(Tetromino.shapes)
+
+
+# A function that returns the observation of a game run by a GameEngine on an
+# ArrayBoard as a dictionary of NumPy arrays: the log2 values of the tiles and
+# the column heights are views of the arrays of the board (not copies, so they
+# change as the game goes on and they must be copied to be kept), the pieces
+# are the ids of the current, the next and the held piece, and the features
+# are the ones of ArrayBoard.get_features (see ArrayBoard.feature_names)
+def observe(engine, reward=0):
+   grid = engine.grid
+   held = engine.held_tetromino
+   pieces = np.array([piece_types.index(engine.current_tetromino.type),
+                      piece_types.index(engine.next_tetromino.type),
+                      -1 if held is None else piece_types.index(held.type)],
+                     dtype=np.int8)
+   return {"values": grid.get_values(), "column_heights": grid.column_heights,
+           "pieces": pieces, "features": grid.get_features(),
+           "reward": np.int64(reward), "score": np.int64(engine.score),
+           "done": np.bool_(engine.done)}
+
+
+# A generator that plays a game with a given GameEngine (on an ArrayBoard) and
+# yields its observations: the first one before any piece is placed and then
+# one after each placed piece, with the score gained by placing it as the
+# reward. The actions for placing each piece can be sent to the generator (a
+# list of GameEngine.actions), otherwise they are taken from the given policy
+# (a function that takes the engine and returns the actions, see
+# self_play.make_policy), and the piece is then moved down by ticks until it
+# is locked. The generator stops when the game is over or max_pieces pieces
+# are placed
+def observation_stream(engine, policy=None, max_pieces=None):
+   actions = yield observe(engine)
+   while not engine.done and (max_pieces is None or
+                              engine.pieces_placed < max_pieces):
+      if actions is None:
+         if policy is None:
+            raise ValueError("The actions must be sent when there is no policy")
+         actions = policy(engine)
+      score = engine.score
+      for action in actions:
+         engine.step(action)
+      while not engine.done and not engine.step("tick"):
+         pass
+      actions = yield observe(engine, engine.score - score)
+
+
+# A class for writing observations in bulk to memory-mapped .npy files: each
+# field of the observations is written to its own files (shards) with
+# shard_size observations in each (the last one can have fewer), e.g.
+# values-00000.npy, values-00001.npy, ... which can be loaded with
+# np.load(path, mmap_mode="r") without reading them into memory
+class ShardWriter:
+   # A constructor for creating a writer for a given directory (which is
+   # created if it does not exist)
+   def __init__(self, directory, shard_size=65536):
+      os.makedirs(directory, exist_ok=True)
+      self.directory = directory
+      self.shard_size = shard_size
+      self.shards = {}  # the memory-mapped arrays of the current shards
+      self.n_shards = 0  # the number of the shards that are created
+      self.n_rows = 0  # the number of the observations in the current shards
+      self.n_written = 0  # the number of all the written observations
+
+   # A method that returns the path of a shard with a given index for a field
+   def shard_path(self, name, index):
+      return os.path.join(self.directory, f"{name}-{index:05d}.npy")
+
+   # A method for writing an observation (a dictionary of arrays with the same
+   # shapes and types for all the observations, see observe), the arrays are
+   # copied into the shards
+   def write(self, observation):
+      if not self.shards or self.n_rows == self.shard_size:
+         self.close()
+         for name, value in observation.items():
+            value = np.asarray(value)
+            self.shards[name] = np.lib.format.open_memmap(
+               self.shard_path(name, self.n_shards), mode="w+",
+               dtype=value.dtype, shape=(self.shard_size,) + value.shape)
+         self.n_shards += 1
+      for name, shard in self.shards.items():
+         shard[self.n_rows] = observation[name]
+      self.n_rows += 1
+      self.n_written += 1
+
+   # A method for writing all the observations of a given iterable (e.g. an
+   # observation_stream), returns the number of the written observations
+   def write_all(self, observations):
+      n_written = self.n_written
+      for observation in observations:
+         self.write(observation)
+      return self.n_written - n_written
+
+   # A method for flushing the current shards to their files, a shard that is
+   # not full is saved again with only the written observations
+   def close(self):
+      shards, self.shards = self.shards, {}
+      for name, shard in shards.items():
+         shard.flush()
+         if self.n_rows < self.shard_size:
+            # the data is copied and the file is unmapped before it is saved
+            data = np.array(shard[:self.n_rows])
+            shards[name] = shard = None
+            np.save(self.shard_path(name, self.n_shards - 1), data)
+      self.n_rows = 0
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc_info):
+      self.close()
+
+
+# A function for writing the observations of headless games to shards from the
+# command line, e.g. python observations.py --games 100 --output observations
+# (the games are played as in self_play.play_game with consecutive seeds)
+def main():
+   parser = argparse.ArgumentParser(
+      description="Write the observations of headless games to .npy shards")
+   parser.add_argument("--games", type=int, default=10)
+   parser.add_argument("--seed", type=int, default=0,
+                       help="the seed of the first game (seeds are consecutive)")
+   parser.add_argument("--grid-height", type=int, default=20)
+   parser.add_argument("--grid-width", type=int, default=12)
+   parser.add_argument("--max-pieces", type=int, default=10000)
+   parser.add_argument("--policy", choices=("random", "bot"), default="random")
+   parser.add_argument("--piece-queue", choices=PieceQueue.distributions,
+                       help="draw the pieces in batches with a distribution")
+   parser.add_argument("--output", default="observations",
+                       help="the directory of the shards")
+   parser.add_argument("--shard-size", type=int, default=65536)
+   args = parser.parse_args()
+
+   with ShardWriter(args.output, args.shard_size) as writer:
+      for seed in range(args.seed, args.seed + args.games):
+         game_rng = random.Random(f"{seed}:game")
+         pieces = make_piece_queue(args.piece_queue, game_rng, args.grid_width)
+         engine = GameEngine(args.grid_height, args.grid_width,
+                             board_class=ArrayBoard, rng=game_rng,
+                             pieces=pieces)
+         policy = make_policy(args.policy, random.Random(f"{seed}:policy"))
+         writer.write_all(observation_stream(engine, policy, args.max_pieces))
+   print(json.dumps({"observations": writer.n_written,
+                     "shards": writer.n_shards}))
+
+
+if __name__ == '__main__':
+   main()
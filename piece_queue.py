@@ -0,0 +1,109 @@
+from tetromino import Tetromino  # the pieces created when they spawn
+import numpy as np  # the fundamental Python module for scientific computing
+
+
+# A class for modeling the sequence of the pieces of a game: the types, the
+# spawn columns and the numbers on the tiles of the pieces are drawn in batches
+# as arrays from a seeded NumPy generator (instead of creating a Tetromino with
+# its Tile objects for each piece as create_tetromino does), and a piece is
+# only turned into a Tetromino when it is taken from the queue. The types are
+# drawn uniformly or from shuffled bags of all the 7 types ("bag"), and the
+# upcoming pieces can be looked at without taking them (e.g. by planners).
+# The taken pieces are kept (7 bytes and a tuple for each piece), so the queue
+# can be rewound to an earlier position (see snapshot and restore).
+class PieceQueue:
+   # the types of the pieces (the index of each type is used in the arrays, as
+   # in BatchEngine)
+   types = tuple(Tetromino.shapes)
+   distributions = ("uniform", "bag")
+
+   # A constructor for creating a queue for a grid with a given width, the
+   # pieces are drawn with the given distribution from a NumPy generator with
+   # the given seed, batch_size pieces at a time
+   def __init__(self, grid_w, seed=None, distribution="uniform",
+                batch_size=1024):
+      if distribution not in PieceQueue.distributions:
+         raise ValueError(f"Unsupported piece distribution: {distribution}")
+      self.grid_width = grid_w
+      self.rng = np.random.default_rng(seed)
+      self.distribution = distribution
+      n_types = len(PieceQueue.types)
+      # the batches of the bag distribution are made of whole bags
+      self.batch_size = -(-batch_size // n_types) * n_types
+      # the size of the tile matrix of each type (the spawn column is chosen so
+      # that the tile matrix is inside the grid, as in the Tetromino class)
+      self.matrix_sizes = np.array([Tetromino.shapes[shape][0]
+                                    for shape in PieceQueue.types])
+      # the drawn pieces: their type indices, spawn columns and the log2
+      # values of the numbers on their tiles (the next piece is at position)
+      self.piece_types = np.zeros(0, dtype=np.int8)
+      self.columns = np.zeros(0, dtype=np.int16)
+      self.values = np.zeros((0, 4), dtype=np.int8)
+      # the same pieces as (type, column, numbers) tuples, from which the
+      # tetrominoes are created without indexing the arrays for each piece
+      self.spawns = []
+      self.position = 0
+
+   # The number of the pieces that are drawn but not taken yet
+   def __len__(self):
+      return len(self.piece_types) - self.position
+
+   # A method for drawing the next batch of pieces and appending them to the
+   # drawn pieces
+   def draw_batch(self):
+      n = self.batch_size
+      if self.distribution == "bag":
+         n_types = len(PieceQueue.types)
+         bags = np.argsort(self.rng.random((n // n_types, n_types)), axis=1)
+         piece_types = bags.ravel()
+      else:
+         piece_types = self.rng.integers(len(PieceQueue.types), size=n)
+      columns = self.rng.integers(
+         0, self.grid_width - self.matrix_sizes[piece_types] + 1)
+      # 2 with 90% and 4 with 10% chance (as in the Tile class)
+      values = np.where(self.rng.random((n, 4)) < 0.1, 2, 1)
+      self.piece_types = np.concatenate(
+         [self.piece_types, piece_types.astype(np.int8)])
+      self.columns = np.concatenate([self.columns, columns.astype(np.int16)])
+      self.values = np.concatenate([self.values, values.astype(np.int8)])
+      shapes = [PieceQueue.types[index] for index in piece_types.tolist()]
+      numbers = map(tuple, (1 << values).tolist())
+      self.spawns.extend(zip(shapes, columns.tolist(), numbers))
+
+   # A method that returns the next n pieces without taking them as the arrays
+   # of their type indices (see types), spawn columns and log2 values of the
+   # numbers on their tiles (views of the queue, which must not be changed)
+   def peek(self, n=1):
+      while len(self) < n:
+         self.draw_batch()
+      end = self.position + n
+      return (self.piece_types[self.position:end],
+              self.columns[self.position:end],
+              self.values[self.position:end])
+
+   # A method that returns the types of the next n pieces (e.g. 'I', 'O')
+   def peek_types(self, n=1):
+      return [PieceQueue.types[index] for index in self.peek(n)[0]]
+
+   # A method that takes the next piece from the queue and returns it as a new
+   # Tetromino at its spawn column in a given row (the top row of the grid)
+   def pop(self, spawn_row):
+      if len(self) == 0:
+         self.draw_batch()
+      shape, column, numbers = self.spawns[self.position]
+      self.position += 1
+      return Tetromino.from_snapshot(
+         (shape, 0, column, spawn_row, numbers))
+
+   # A method that returns the state of the queue (the number of the taken
+   # pieces), which can be given to restore later
+   def snapshot(self):
+      return self.position
+
+   # A method for rewinding (or forwarding) the queue to the state of a
+   # snapshot (the pieces are drawn again from the same generator, so the
+   # pieces after the position are the same)
+   def restore(self, snapshot):
+      while len(self.piece_types) < snapshot:
+         self.draw_batch()
+      self.position = snapshot
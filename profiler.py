@@ -0,0 +1,126 @@
+import lib.stddraw as stddraw  # the show function is timed when instrumented
+from tetromino import Tetromino  # the ghost computation is timed
+from collections import deque  # used for the rolling windows of timings
+import contextlib  # used for the phases when profiling is disabled
+import sys  # used for printing the reports
+import time  # used for timing
+
+
+# A class for recording the durations of the phases of the game loop (input
+# handling, gravity, locking, merging, clearing, drawing, ...) in rolling
+# windows of the latest samples, which are summarized as percentiles. The
+# phases of the loop are timed with the phase method, and the methods of a
+# GameGrid (and the ghost computation and stddraw.show) are timed by replacing
+# them with timed wrappers in instrument, so nothing is changed and there is
+# no overhead when the profiler is not used (see also null_phase)
+class PhaseProfiler:
+   # the names of the phases that are timed by instrument and the methods
+   grid_phases = {"update_grid": "lock", "merge_tiles": "merge",
+                  "clear_full_rows": "row_clear",
+                  "remove_free_tiles": "free_tiles",
+                  "draw_grid": "grid_draw", "draw_panel": "panel_draw"}
+   renderer_phases = {"display": "frame", "update_layer": "layer_draw",
+                      "draw_view": "view_draw"}
+
+   # A constructor for creating a profiler that keeps the latest window
+   # samples of each phase
+   def __init__(self, window=1000):
+      self.window = window
+      self.samples = {}  # the durations (in seconds) of each phase
+      self.patches = []  # the replaced attributes as (owner, name, value)
+
+   # A method for adding the duration (in seconds) of a phase
+   def record(self, name, duration):
+      samples = self.samples.get(name)
+      if samples is None:
+         samples = self.samples[name] = deque(maxlen=self.window)
+      samples.append(duration)
+
+   # A method that returns a context manager for timing a phase, e.g.
+   # with profiler.phase("input"): ...
+   @contextlib.contextmanager
+   def phase(self, name):
+      start = time.perf_counter()
+      try:
+         yield
+      finally:
+         self.record(name, time.perf_counter() - start)
+
+   # A method for timing the given GameGrid (and the renderer drawing it if
+   # given): the methods of its lock pipeline and its drawing methods, the
+   # ghost computation of the tetrominoes and stddraw.show are replaced with
+   # timed wrappers until uninstrument is called
+   def instrument(self, grid, renderer=None):
+      for method, name in PhaseProfiler.grid_phases.items():
+         if hasattr(grid, method):
+            self.wrap(grid, method, name)
+      if renderer is not None:
+         for method, name in PhaseProfiler.renderer_phases.items():
+            if hasattr(renderer, method):
+               self.wrap(renderer, method, name)
+      self.wrap(Tetromino, "get_ghost_copy", "ghost")
+      self.wrap(stddraw, "show", "show")
+
+   # A method for replacing an attribute (a function or a method) of a given
+   # object with a wrapper that records its durations as the given phase
+   def wrap(self, owner, attribute, name):
+      original = getattr(owner, attribute)
+      record, perf_counter = self.record, time.perf_counter
+
+      def timed(*args, **kwargs):
+         start = perf_counter()
+         try:
+            return original(*args, **kwargs)
+         finally:
+            record(name, perf_counter() - start)
+
+      # the value of the attribute in the object itself (None when it is
+      # inherited, e.g. a method of the class of a GameGrid object)
+      own = vars(owner).get(attribute)
+      self.patches.append((owner, attribute, own))
+      setattr(owner, attribute, timed)
+
+   # A method for restoring the attributes replaced by instrument
+   def uninstrument(self):
+      while self.patches:
+         owner, attribute, own = self.patches.pop()
+         if own is None:
+            delattr(owner, attribute)
+         else:
+            setattr(owner, attribute, own)
+
+   # A method that returns the number of samples, the 50th, 95th and 99th
+   # percentiles and the maximum (in milliseconds) of each phase
+   def percentiles(self):
+      summary = {}
+      for name, samples in sorted(self.samples.items()):
+         ordered = sorted(samples)
+         n = len(ordered)
+         summary[name] = {
+            "count": n,
+            "p50_ms": ordered[(n - 1) * 50 // 100] * 1000,
+            "p95_ms": ordered[(n - 1) * 95 // 100] * 1000,
+            "p99_ms": ordered[(n - 1) * 99 // 100] * 1000,
+            "max_ms": ordered[-1] * 1000}
+      return summary
+
+   # A method for printing the percentiles of the phases as a table (to the
+   # standard output by default)
+   def dump(self, file=None):
+      file = sys.stdout if file is None else file
+      print(f"{'phase':<12}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'max ms':>10}", file=file)
+      for name, stats in self.percentiles().items():
+         print(f"{name:<12}{stats['count']:>8}{stats['p50_ms']:>10.3f}"
+               f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+               f"{stats['max_ms']:>10.3f}", file=file)
+      file.flush()
+
+
+# A function that can be used in place of PhaseProfiler.phase when profiling
+# is disabled (the same context manager that does nothing is returned)
+def null_phase(name):
+   return _null_context
+
+
+_null_context = contextlib.nullcontext()
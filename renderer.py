@@ -0,0 +1,232 @@
+import lib.stddraw as stddraw  # used for drawing the game
+from lib.picture import Picture  # used for caching the drawn layer
+from point import Point  # used for the positions of the tiles in the view
+from tile import Tile  # used for drawing the tiles in the view
+import numpy as np  # the fundamental Python module for scientific computing
+import atexit  # used for removing the directory of the saved layer
+import os  # used for the path of the saved layer
+import shutil  # used for removing the directory of the saved layer
+import tempfile  # used for a directory to save the layer
+
+
+# A class for drawing a GameGrid in layers: the background (the grid lines and
+# the boundaries), the locked tiles and the side panel are drawn once onto a
+# layer that is cached as a picture, and only the cells changed since the last
+# frame (by a lock, a merge, a clear or a removal) are redrawn on it. Each frame
+# draws the cached layer with a single picture and then the active tetromino,
+# its ghost and the score on top of it, so the time for a frame does not grow
+# with the number of tiles on the grid. The tiles are only read when the grid
+# is updated (see Board.n_updates) and the layer is copied from the canvas in
+# memory.
+class LayeredRenderer:
+   # A constructor for creating a renderer for a given GameGrid
+   def __init__(self, grid):
+      self.grid = grid
+      self.layer = None  # the cached layer as a Picture
+      self.layer_values = None  # the tiles (log2 values) drawn on the layer
+      self.layer_updates = None  # the updates of the grid drawn on the layer
+      self.panel_key = None  # what is drawn on the panel of the layer
+      # the file for saving the layer when the canvas cannot be copied in
+      # memory (created when it is first needed)
+      self.layer_file = None
+
+   # A method for drawing a frame of the game in the same way as the display
+   # method of GameGrid (the frame is shown for show_delay milliseconds)
+   def display(self, next_tetromino=None, held_tetromino=None, level=1,
+               show_delay=250, upcoming=None):
+      panel_key = (preview_key(next_tetromino), preview_key(held_tetromino),
+                   level, tuple(upcoming or ()))
+      if self.layer is None or panel_key != self.panel_key or \
+         self.grid.n_updates != self.layer_updates:
+         self.update_layer(self.grid.get_values(), next_tetromino,
+                           held_tetromino, level, upcoming)
+         self.panel_key = panel_key
+      else:
+         stddraw.picture(self.layer)
+
+      current_tetromino = self.grid.current_tetromino
+      if current_tetromino is not None:
+         ghost = current_tetromino.get_ghost_copy(self.grid)
+         ghost.draw(self.grid.grid_height, ghost=True)
+         current_tetromino.draw(self.grid.grid_height)
+         self.grid.draw_boundaries()  # the boundaries are drawn over the pieces
+      self.grid.draw_score()
+
+      stddraw.show(show_delay)
+
+   # A method for redrawing the cells that are changed since the layer was
+   # drawn (the whole grid for the first layer) and the panel, and caching the
+   # result as the new layer
+   def update_layer(self, values, next_tetromino, held_tetromino, level,
+                    upcoming=None):
+      if self.layer is None:
+         stddraw.clear(self.grid.empty_cell_color)
+         self.grid.draw_grid()
+      else:
+         stddraw.picture(self.layer)
+         for row, col in zip(*np.nonzero(values != self.layer_values)):
+            self.grid.draw_cell(row, col)
+      self.grid.draw_boundaries()
+      self.grid.draw_panel(next_tetromino, held_tetromino, level,
+                           upcoming=upcoming)
+
+      self.layer = self.capture_layer()
+      self.layer_values = values.copy()
+      self.layer_updates = self.grid.n_updates
+
+   # A method that returns a copy of the canvas as a Picture (the surface of
+   # the canvas is copied in memory, or the canvas is saved to a file and
+   # loaded when the drawing module does not have a surface)
+   def capture_layer(self):
+      surface = getattr(stddraw, "_surface", None)
+      if surface is not None:
+         layer = Picture(surface.get_width(), surface.get_height())
+         layer._surface = surface.copy()
+         return layer
+      if self.layer_file is None:
+         # the layer is saved as an uncompressed image for loading it quickly
+         # and the directory is removed at exit
+         directory = tempfile.mkdtemp()
+         atexit.register(shutil.rmtree, directory, True)
+         self.layer_file = os.path.join(directory, "layer.bmp")
+      stddraw.save(self.layer_file)
+      return Picture(self.layer_file)
+
+   # A method for redrawing the whole layer in the next frame (e.g. when the
+   # canvas is cleared for another screen)
+   def invalidate(self):
+      self.layer = None
+
+   # A method for drawing a given GameGrid (e.g. the grid of a new game) from
+   # the next frame on
+   def reset(self, grid):
+      self.grid = grid
+      self.layer_values = None
+      self.layer_updates = None
+      self.panel_key = None
+      self.invalidate()
+
+
+# A function that returns the type, the rotation and the numbers on the tiles of
+# a given tetromino (None if there is no tetromino), which determine how its
+# preview is drawn on the panel
+def preview_key(tetromino):
+   if tetromino is None:
+      return None
+   return (tetromino.type, tetromino.rotation,
+           tuple(tile.number for tile in tetromino.tiles))
+
+
+# A class for drawing a part (a view) of a large GameGrid that follows the
+# active tetromino and that can be zoomed in and out: only the tiles and the
+# grid lines in the view are drawn in each frame, so the time for a frame does
+# not grow with the area of the grid. The view is drawn in the left part of the
+# canvas and the side panel, the boundaries and the score are drawn as for a
+# grid with the size of the layout (the size of the view without zoom)
+class ViewportRenderer:
+   margin = 4  # the distance kept between the tetromino and the view edges
+   # the zoom is the size of the view / the size of the layout (the largest
+   # view is limited so that a frame draws a bounded number of cells)
+   min_zoom, max_zoom, zoom_step = 0.5, 4.0, 1.25
+
+   # A constructor for creating a renderer for a given GameGrid with a view of
+   # the given size (the layout, which determines the size of the canvas)
+   def __init__(self, grid, view_h=20, view_w=12):
+      self.grid = grid
+      self.layout_height = min(view_h, grid.grid_height)
+      self.layout_width = min(view_w, grid.grid_width)
+      self.zoom_factor = 1.0
+      self.view_height, self.view_width = self.layout_height, self.layout_width
+      self.view_x, self.view_y = 0, 0  # the bottom left cell of the view
+
+   # A method for drawing a given GameGrid (e.g. the grid of a new game) from
+   # the next frame on, with the view at the bottom left corner (the zoom is
+   # kept)
+   def reset(self, grid):
+      self.grid = grid
+      self.view_x, self.view_y = 0, 0
+
+   # A method for zooming the view out (steps > 0) or in (steps < 0), the view
+   # is not made larger than the grid
+   def zoom(self, steps):
+      max_zoom = min(self.grid.grid_height / self.layout_height,
+                     self.grid.grid_width / self.layout_width,
+                     ViewportRenderer.max_zoom)
+      factor = self.zoom_factor * ViewportRenderer.zoom_step ** steps
+      self.zoom_factor = max(ViewportRenderer.min_zoom, min(factor, max_zoom))
+      self.view_height = max(1, round(self.layout_height * self.zoom_factor))
+      self.view_width = max(1, round(self.layout_width * self.zoom_factor))
+
+   # A method for scrolling the view so that the given tetromino is in it
+   def follow(self, tetromino):
+      position = tetromino.bottom_left_cell
+      self.view_x = scroll(self.view_x, position.x, self.view_width,
+                           self.grid.grid_width, ViewportRenderer.margin)
+      self.view_y = scroll(self.view_y, position.y, self.view_height,
+                           self.grid.grid_height, ViewportRenderer.margin)
+
+   # A method for drawing a frame of the game in the same way as the display
+   # method of GameGrid (the frame is shown for show_delay milliseconds)
+   def display(self, next_tetromino=None, held_tetromino=None, level=1,
+               show_delay=250, upcoming=None):
+      current_tetromino = self.grid.current_tetromino
+      if current_tetromino is not None:
+         self.follow(current_tetromino)
+      # the view is drawn with the scale that maps it to the left part of the
+      # canvas (where the grid is drawn in the layout)
+      x0, y0 = self.view_x - 0.5, self.view_y - 0.5
+      scale = self.view_width / self.layout_width
+      stddraw.setXscale(x0, x0 + scale * (self.layout_width + 6))
+      stddraw.setYscale(y0, y0 + self.view_height)
+      stddraw.clear(self.grid.empty_cell_color)
+      self.draw_view()
+      if current_tetromino is not None:
+         ghost = current_tetromino.get_ghost_copy(self.grid)
+         ghost.draw(self.grid.grid_height, ghost=True)
+         current_tetromino.draw(self.grid.grid_height)
+
+      # the panel (which covers the tiles outside the view), the boundaries and
+      # the score are drawn with the scale of the layout
+      layout = (self.layout_height, self.layout_width)
+      reset_scale(*layout)
+      self.grid.draw_panel(next_tetromino, held_tetromino, level, layout,
+                           upcoming)
+      self.grid.draw_boundaries(layout)
+      self.grid.draw_score(layout)
+
+      stddraw.show(show_delay)
+
+   # A method for drawing the tiles and the grid lines in the view
+   def draw_view(self):
+      x, y = self.view_x, self.view_y
+      h, w = self.view_height, self.view_width
+      values = self.grid.get_values()[y:y + h, x:x + w]
+      for row, col in zip(*np.nonzero(values)):
+         tile = Tile.with_number(1 << int(values[row, col]))
+         tile.draw(Point(x + int(col), y + int(row)))
+      stddraw.setPenColor(self.grid.line_color)
+      stddraw.setPenRadius(self.grid.line_thickness)
+      for line_x in range(x, x + w - 1):
+         stddraw.line(line_x + 0.5, y - 0.5, line_x + 0.5, y + h - 0.5)
+      for line_y in range(y, y + h - 1):
+         stddraw.line(x - 0.5, line_y + 0.5, x + w - 0.5, line_y + 0.5)
+      stddraw.setPenRadius()
+
+
+# A function that returns the first cell of a view with the given size that
+# keeps a position at least margin cells away from the edges of the view (when
+# possible) by moving the view from the given first cell as little as possible
+def scroll(start, position, view_size, total_size, margin):
+   margin = min(margin, (view_size - 1) // 2)
+   if position < start + margin:
+      start = position - margin
+   elif position > start + view_size - 1 - margin:
+      start = position - view_size + 1 + margin
+   return max(0, min(start, total_size - view_size))
+
+
+# A function for setting the scale of the canvas for drawing a grid with the
+# given size and the side panel next to it (as in Tetris_2048.start)
+def reset_scale(grid_h, grid_w):
+   stddraw.setXscale(-0.5, grid_w + 5.5)
+   stddraw.setYscale(-0.5, grid_h - 0.5)
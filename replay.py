@@ -0,0 +1,202 @@
+from game_engine import GameEngine  # the game rules without drawing
+from board import Board  # the default board of the recorded games
+from array_board import ArrayBoard  # the compact board used for replaying
+from piece_queue import PieceQueue  # the pieces of the games with a queue
+import numpy as np  # the fundamental Python module for scientific computing
+import random  # used for the seeded random number generators
+import struct  # used for the binary replay format
+import sys  # used for the command line arguments
+
+
+# A class for modeling the replay log of a game: the seed of its random number
+# generator, the dimensions of its grid, all the actions given to the game
+# engine (the keys, the ticks and the holds) and the score and the tiles on
+# the grid at the end, which are used for checking a replay of the game.
+# The pieces of a game are created with a random.Random seeded with the seed,
+# or taken from a PieceQueue seeded with it when a queue distribution is given.
+# Binary format (little endian): the header (see header_formats, version 1 logs
+# without the distribution can also be loaded), the actions
+# as runs of the same action with 1 byte per run (the index of the action in
+# GameEngine.actions in the upper 3 bits and the length of the run - 1 in the
+# lower 5 bits), the final score (8 bytes) and the final log2 values of the
+# tiles (1 byte per cell, row by row from the bottom)
+class ReplayLog:
+   magic, version = b"T2RP", 2
+   # magic, version, grid height, grid width, seed, number of action runs and
+   # the piece queue distribution (0 for none, 1 + the index in
+   # PieceQueue.distributions otherwise) in the versions 2 and 1
+   header_formats = {2: "<4sBHHqIB", 1: "<4sBHHqI"}
+   max_run = 32  # the longest run of actions stored in a single byte
+
+   # A constructor for creating an empty log of a game with the given seed
+   # (and the distribution of its piece queue, if any)
+   def __init__(self, seed, grid_h=20, grid_w=12, piece_queue=None):
+      self.seed = seed
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.piece_queue = piece_queue
+      self.actions = []  # the indices of the actions in GameEngine.actions
+      self.score = None  # the score at the end of the game
+      self.values = None  # the log2 values of the tiles at the end
+
+   # A method for appending an action to the log
+   def append(self, action):
+      self.actions.append(GameEngine.actions.index(action))
+
+   # A method for storing the final score and tiles of the game of the given
+   # game engine in the log
+   def finish(self, engine):
+      self.score = engine.score
+      self.values = np.array(engine.grid.get_values(), dtype=np.int8)
+
+   # A method that returns the log in the binary format
+   def tobytes(self):
+      runs = bytearray()
+      for action in self.actions:
+         if runs and runs[-1] >> 5 == action and \
+            (runs[-1] & 0x1F) + 1 < ReplayLog.max_run:
+            runs[-1] += 1
+         else:
+            runs.append(action << 5)
+      distribution = 0 if self.piece_queue is None else \
+         PieceQueue.distributions.index(self.piece_queue) + 1
+      header = struct.pack(ReplayLog.header_formats[ReplayLog.version],
+                           ReplayLog.magic, ReplayLog.version,
+                           self.grid_height, self.grid_width, self.seed,
+                           len(runs), distribution)
+      return header + bytes(runs) + struct.pack("<q", self.score or 0) + \
+         self.final_values().tobytes()
+
+   # A method for creating a log from the bytes returned by tobytes
+   @classmethod
+   def from_bytes(cls, data):
+      magic, version = struct.unpack_from("<4sB", data)
+      if magic != ReplayLog.magic or version not in ReplayLog.header_formats:
+         raise ValueError("Unsupported replay log format")
+      header_format = ReplayLog.header_formats[version]
+      header_size = struct.calcsize(header_format)
+      _, _, grid_h, grid_w, seed, n_runs, *distribution = struct.unpack_from(
+         header_format, data)
+      piece_queue = None
+      if distribution and distribution[0]:
+         piece_queue = PieceQueue.distributions[distribution[0] - 1]
+      log = cls(seed, grid_h, grid_w, piece_queue)
+      runs = data[header_size:header_size + n_runs]
+      for run in runs:
+         log.actions.extend([run >> 5] * ((run & 0x1F) + 1))
+      offset = header_size + n_runs
+      log.score, = struct.unpack_from("<q", data, offset)
+      values = np.frombuffer(data, dtype=np.int8, count=grid_h * grid_w,
+                             offset=offset + 8)
+      log.values = values.reshape(grid_h, grid_w).copy()
+      return log
+
+   # Methods for saving the log to a file and loading it from a file
+   def save(self, path):
+      with open(path, "wb") as file:
+         file.write(self.tobytes())
+
+   @classmethod
+   def load(cls, path):
+      with open(path, "rb") as file:
+         return cls.from_bytes(file.read())
+
+   # A method that returns the final tiles (an empty grid if not finished)
+   def final_values(self):
+      if self.values is None:
+         return np.zeros((self.grid_height, self.grid_width), dtype=np.int8)
+      return self.values
+
+
+# A class for modeling a game engine that records all the actions given to it
+# in a replay log, the game is created with a random number generator (or a
+# piece queue with the given distribution) seeded with the given seed (or a
+# random seed)
+class RecordingEngine(GameEngine):
+   def __init__(self, grid_h=20, grid_w=12, board_class=Board, seed=None,
+                piece_queue=None):
+      self.first_seed = seed
+      self.piece_queue = piece_queue
+      super().__init__(grid_h, grid_w, board_class)
+
+   # A method for starting a new game with a new log (with the given seed or a
+   # random seed, the seed given to the constructor is used for the first game)
+   def reset(self, seed=None):
+      if seed is None:
+         seed = self.first_seed if self.first_seed is not None else new_seed()
+      self.first_seed = None
+      self.rng = random.Random(seed)
+      self.pieces = new_piece_queue(self.grid_width, seed, self.piece_queue)
+      self.log = ReplayLog(seed, self.grid_height, self.grid_width,
+                           self.piece_queue)
+      super().reset()
+
+   def step(self, action):
+      done = self.done
+      locked = super().step(action)
+      if not done:
+         self.log.append(action)
+      return locked
+
+   # A method that returns the log of the game with its current score and tiles
+   def finish_log(self):
+      self.log.finish(self)
+      return self.log
+
+
+# A function that returns a random seed for a new game
+def new_seed():
+   return random.SystemRandom().randrange(2 ** 63)
+
+
+# A function that returns a piece queue with a given distribution for a game
+# with a given seed (None when no distribution is given)
+def new_piece_queue(grid_w, seed, distribution):
+   if distribution is None:
+      return None
+   return PieceQueue(grid_w, seed, distribution)
+
+
+# A function that returns a game engine at the start of the game of a given
+# log (with the same pieces as the recorded game)
+def replay_engine(log, board_class=ArrayBoard):
+   return GameEngine(log.grid_height, log.grid_width, board_class,
+                     rng=random.Random(log.seed),
+                     pieces=new_piece_queue(log.grid_width, log.seed,
+                                            log.piece_queue))
+
+
+# A function for replaying the actions in a given log without drawing (as
+# fast as the rules run), returns the game engine at the end of the replay
+def replay(log, board_class=ArrayBoard):
+   engine = replay_engine(log, board_class)
+   step = engine.step
+   for action in log.actions:
+      step(GameEngine.actions[action])
+   return engine
+
+
+# A function for checking if replaying a given log ends with the score and
+# the tiles stored in the log
+def verify(log, board_class=ArrayBoard):
+   engine = replay(log, board_class)
+   return engine.score == log.score and \
+      np.array_equal(engine.grid.get_values(), log.final_values())
+
+
+# A function for checking the replay logs given as command line arguments,
+# e.g. python replay.py replays/*.t2r
+def main():
+   failed = 0
+   for path in sys.argv[1:]:
+      if verify(ReplayLog.load(path)):
+         print(f"OK       {path}")
+      else:
+         print(f"MISMATCH {path}")
+         failed += 1
+   print(f"{len(sys.argv) - 1 - failed} passed, {failed} failed")
+   return 1 if failed else 0
+
+
+if __name__ == '__main__':
+   sys.exit(main())
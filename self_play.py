@@ -0,0 +1,186 @@
+from game_engine import GameEngine  # the game rules without drawing
+from array_board import ArrayBoard  # the compact board used for self-play
+from bot import PlacementBot  # the bot policy
+from piece_queue import PieceQueue  # the pieces drawn in batches
+from multiprocessing import Pool  # used for running the games in parallel
+import argparse  # used for the command line options
+import json  # used for printing the summary statistics
+import random  # used for the seeded random number generators
+
+
+# A function for playing a single game without drawing where the tetrominoes
+# and the numbers on their tiles are drawn from a random number generator
+# seeded with the given seed, and the pieces are placed by the given policy:
+# "random" rotates and moves each piece randomly (with a separately seeded
+# generator) and then drops it, "bot" places each piece with a PlacementBot,
+# so the result of a game only depends on its seed and the options. When a
+# piece_queue distribution is given, the pieces are taken from a PieceQueue
+# with that distribution (see make_piece_queue).
+# Returns the result of the game as a dictionary
+def play_game(seed, grid_h=20, grid_w=12, max_pieces=10000, policy="random",
+              piece_queue=None):
+   game_rng = random.Random(f"{seed}:game")
+   policy_rng = random.Random(f"{seed}:policy")
+   engine = GameEngine(grid_h, grid_w, board_class=ArrayBoard, rng=game_rng,
+                       pieces=make_piece_queue(piece_queue, game_rng, grid_w))
+   choose_actions = make_policy(policy, policy_rng)
+   while not engine.done and engine.pieces_placed < max_pieces:
+      for action in choose_actions(engine):
+         engine.step(action)
+      engine.step("tick")
+
+   if engine.won:
+      end_reason = "won"
+   elif engine.done:
+      end_reason = "game_over"
+   else:
+      end_reason = "max_pieces"
+   return {"seed": seed, "score": engine.score,
+           "lines_cleared": engine.grid.lines_cleared,
+           "max_tile": engine.max_tile(),
+           "pieces_placed": engine.pieces_placed, "end_reason": end_reason}
+
+
+# A function that returns a policy with a given name as a function that takes
+# a GameEngine and returns the actions for placing its current tetromino (see
+# play_game), the random policy draws the actions from the given generator
+def make_policy(policy, policy_rng):
+   if policy == "bot":
+      return PlacementBot().choose_actions
+   if policy == "random":
+      return lambda engine: random_actions(engine, policy_rng)
+   raise ValueError(f"Unsupported policy: {policy}")
+
+
+# A function that returns a PieceQueue with a given distribution ("uniform" or
+# "bag") seeded from the given generator, or None when no distribution is
+# given (the pieces are then created with the generator one by one)
+def make_piece_queue(distribution, game_rng, grid_w):
+   if distribution is None:
+      return None
+   return PieceQueue(grid_w, game_rng.getrandbits(64), distribution)
+
+
+# A function that returns random actions for placing the current tetromino of
+# a given GameEngine: it is rotated 0-3 times, moved to the left or to the right
+# up to half the width of the grid and then dropped
+def random_actions(engine, rng):
+   actions = ["rotate"] * rng.randrange(4)
+   direction = rng.choice(("left", "right"))
+   actions += [direction] * rng.randrange(engine.grid_width // 2 + 1)
+   actions.append("hard_drop")
+   return actions
+
+
+# A helper function for playing a game in a worker process with the options
+# given as a tuple (pool.imap_unordered passes a single argument)
+def _play_game(args):
+   seed, options = args
+   return play_game(seed, **options)
+
+
+# A function that plays the games with the given seeds on a pool of processes
+# (all the CPUs by default) and yields the result of each game as soon as it
+# is finished (not in the order of the seeds), the options are passed to
+# play_game
+def run_games(seeds, processes=None, chunksize=16, **options):
+   with Pool(processes) as pool:
+      tasks = ((seed, options) for seed in seeds)
+      for result in pool.imap_unordered(_play_game, tasks, chunksize):
+         yield result
+
+
+# A class for aggregating the results of the games into summary statistics
+# without keeping the results (the statistics of different runs can be merged)
+class GameStats:
+   def __init__(self):
+      self.games = 0
+      self.totals = {"score": 0, "lines_cleared": 0, "pieces_placed": 0}
+      self.best = None  # the result of the game with the highest score
+      self.min_score = None
+      self.max_tiles = {}  # the number of games for each max tile
+      self.end_reasons = {}  # the number of games for each end reason
+
+   # A method for adding the result of a game to the statistics
+   def add(self, result):
+      self.games += 1
+      for key in self.totals:
+         self.totals[key] += result[key]
+      if self.best is None or result["score"] > self.best["score"]:
+         self.best = result
+      if self.min_score is None or result["score"] < self.min_score:
+         self.min_score = result["score"]
+      count_in(self.max_tiles, result["max_tile"])
+      count_in(self.end_reasons, result["end_reason"])
+
+   # A method for merging the statistics of another run into this one
+   def merge(self, other):
+      self.games += other.games
+      for key in self.totals:
+         self.totals[key] += other.totals[key]
+      if other.best is not None and \
+         (self.best is None or other.best["score"] > self.best["score"]):
+         self.best = other.best
+      if other.min_score is not None and \
+         (self.min_score is None or other.min_score < self.min_score):
+         self.min_score = other.min_score
+      for max_tile, count in other.max_tiles.items():
+         count_in(self.max_tiles, max_tile, count)
+      for end_reason, count in other.end_reasons.items():
+         count_in(self.end_reasons, end_reason, count)
+
+   # A method that returns the summary statistics as a dictionary
+   def summary(self):
+      summary = {"games": self.games, "min_score": self.min_score,
+                 "max_score": self.best and self.best["score"],
+                 "best_seed": self.best and self.best["seed"]}
+      for key, total in self.totals.items():
+         summary[f"mean_{key}"] = total / self.games if self.games else None
+      summary["max_tiles"] = dict(sorted(self.max_tiles.items()))
+      summary["end_reasons"] = dict(sorted(self.end_reasons.items()))
+      return summary
+
+
+# A helper function for counting a key in a dictionary of counts
+def count_in(counts, key, count=1):
+   counts[key] = counts.get(key, 0) + count
+
+
+# A function for running self-play games from the command line, e.g.
+# python self_play.py --games 100000 --seed 0 --processes 32
+def main():
+   parser = argparse.ArgumentParser(description="Run headless self-play games")
+   parser.add_argument("--games", type=int, default=1000)
+   parser.add_argument("--seed", type=int, default=0,
+                       help="the seed of the first game (seeds are consecutive)")
+   parser.add_argument("--processes", type=int, default=None)
+   parser.add_argument("--grid-height", type=int, default=20)
+   parser.add_argument("--grid-width", type=int, default=12)
+   parser.add_argument("--max-pieces", type=int, default=10000)
+   parser.add_argument("--policy", choices=("random", "bot"), default="random")
+   parser.add_argument("--piece-queue", choices=PieceQueue.distributions,
+                       help="draw the pieces in batches with a distribution")
+   parser.add_argument("--results", help="a file for the result of each game "
+                                         "(one JSON object per line)")
+   args = parser.parse_args()
+
+   seeds = range(args.seed, args.seed + args.games)
+   stats = GameStats()
+   results_file = open(args.results, "w") if args.results else None
+   try:
+      for result in run_games(seeds, args.processes,
+                              grid_h=args.grid_height, grid_w=args.grid_width,
+                              max_pieces=args.max_pieces,
+                              policy=args.policy,
+                              piece_queue=args.piece_queue):
+         stats.add(result)
+         if results_file is not None:
+            results_file.write(json.dumps(result) + "\n")
+   finally:
+      if results_file is not None:
+         results_file.close()
+   print(json.dumps(stats.summary(), indent=2))
+
+
+if __name__ == '__main__':
+   main()
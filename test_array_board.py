@@ -0,0 +1,24 @@
+from board import Board  # the game rules on Tile objects
+from array_board import ArrayBoard  # the board under test
+from grid_ops import merge_columns  # the merge kernel
+import numpy as np  # the fundamental Python module for scientific computing
+
+
+# A test for checking that the rules can be applied to an empty board (all the
+# columns are merge candidates, but their heights are 0) as on a Board
+def test_empty_board_rules():
+   for board in (ArrayBoard(20, 12), Board(20, 12)):
+      board.merge_tiles()
+      board.clear_full_rows()
+      board.remove_free_tiles()
+      assert board.score == 0
+      assert not np.any(board.get_values())
+
+
+# A test for checking that the merge kernel accepts grids without any rows
+def test_merge_columns_of_empty_grids():
+   score, sources = merge_columns(np.zeros((0, 3), dtype=np.int8),
+                                  return_sources=True)
+   assert score == 0 and sources.shape == (0, 3)
+   scores, _ = merge_columns(np.zeros((2, 0, 3), dtype=np.int8))
+   assert scores.tolist() == [0, 0]
@@ -0,0 +1,40 @@
+from game_engine import GameEngine  # the game rules without drawing
+from array_board import ArrayBoard  # the compact board of the games
+from tetromino import Tetromino  # used for setting the current tetromino
+from bot import PlacementBot  # the bot under test
+import numpy as np  # the fundamental Python module for scientific computing
+import random  # used for the seeded random number generators
+
+
+# A test for checking that the bot rotates the tetromino when a rotated
+# placement scores best: the bottom row has a gap of 4 cells that only a
+# horizontal I tetromino (rotation 1 or 3) fills, which clears the row
+def test_rotated_placement_is_chosen():
+   engine = GameEngine(20, 12, board_class=ArrayBoard, rng=random.Random(0))
+   values = np.zeros((20, 12), dtype=np.int8)
+   values[0] = [1, 2, 3, 4, 0, 0, 0, 0, 1, 2, 3, 4]
+   engine.grid.restore((values.tobytes(), 0, False, 0, True))
+   engine.current_tetromino = Tetromino.from_snapshot(
+      ("I", 0, 5, 19, (2, 2, 2, 2)))
+   engine.grid.current_tetromino = engine.current_tetromino
+
+   actions = PlacementBot(use_hold=False).choose_actions(engine)
+   assert "rotate" in actions
+   for action in actions:
+      engine.step(action)
+   engine.step("tick")
+   assert engine.grid.lines_cleared == 1
+   assert not np.any(engine.grid.get_values())
+
+
+# A test for checking that the placements that are searched again are taken
+# from the cache (it is keyed by the board and the position of the tetromino)
+# and that the same actions are chosen with them
+def test_cache_is_hit_for_searched_placements():
+   engine = GameEngine(20, 12, board_class=ArrayBoard, rng=random.Random(0))
+   bot = PlacementBot(use_hold=False)
+   actions = bot.choose_actions(engine)
+   misses = bot.cache.misses
+   assert bot.cache.hits == 0 and misses > 0
+   assert bot.choose_actions(engine) == actions
+   assert bot.cache.hits == misses and bot.cache.misses == misses
@@ -0,0 +1,47 @@
+from game_engine import GameEngine  # the engine under test
+from piece_queue import PieceQueue  # the pieces drawn in batches
+import random  # used for the seeded random number generators
+
+
+# A test for checking that the engines with different grid sizes do not
+# change each other (the tetrominoes of each engine stay on its own grid)
+def test_engines_with_different_sizes():
+   small = GameEngine(20, 12, rng=random.Random(0))
+   GameEngine(40, 30, rng=random.Random(1))
+   for _ in range(30):
+      small.step("right")
+   tetromino = small.current_tetromino
+   assert tetromino.bottom_left_cell.x + tetromino.current_rotation.max_dx \
+      == 11
+   small.step("hard_drop")
+   assert small.step("tick")
+   assert not small.done
+   assert small.current_tetromino.bottom_left_cell.y == 19
+
+
+# A function that drops the tetrominoes of a game until n of them are locked,
+# returns the snapshots of the locked tetrominoes
+def drop_pieces(engine, n):
+   locked = []
+   for _ in range(n):
+      locked.append(engine.current_tetromino.snapshot())
+      engine.step("hard_drop")
+      engine.step("tick")
+   return locked
+
+
+# A test for checking that a game restored from a snapshot goes on with the
+# same pieces (with a piece queue and with a random number generator), so the
+# snapshots can be used for undoing moves and rewinding games
+def test_restore_rewinds_the_pieces():
+   for pieces in (PieceQueue(12, seed=0, batch_size=7), None):
+      engine = GameEngine(20, 12, rng=random.Random(0), pieces=pieces)
+      engine.step("hold")
+      snapshot = engine.snapshot()
+      upcoming = engine.upcoming_types(3)
+      locked = drop_pieces(engine, 20)
+      end = engine.snapshot()
+      engine.restore(snapshot)
+      assert engine.upcoming_types(3) == upcoming
+      assert drop_pieces(engine, 20) == locked
+      assert engine.snapshot() == end
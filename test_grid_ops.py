@@ -0,0 +1,275 @@
+from board import Board  # the game rules on Tile objects
+from array_board import ArrayBoard  # the game rules on an integer array
+from grid_ops import merge_columns, clear_full_rows  # the kernels under test
+from grid_ops import column_heights, connected_cells  # (as above)
+import grid_ops  # used for changing the size of the small merges
+from tetromino import Tetromino  # the pieces locked on the boards
+from collections import deque  # used for the reference flood fill
+import random  # used for the seeded random number generators
+import numpy as np  # the fundamental Python module for scientific computing
+
+
+# A function that returns random log2 values of the tiles of a grid with given
+# dimensions (small numbers, so many equal tiles are next to each other, and
+# empty cells with the given density)
+def random_values(rng, grid_h, grid_w, empty=0.3, max_exponent=3):
+   values = rng.integers(1, max_exponent + 1, size=(grid_h, grid_w))
+   values[rng.random((grid_h, grid_w)) < empty] = 0
+   return values.astype(np.int8)
+
+
+# A function that returns a board of a given class with the given log2 values
+# of the tiles
+def board_with(board_class, values):
+   board = board_class(*values.shape)
+   board.restore((values.tobytes(), 0, False, 0, True))
+   return board
+
+
+# A function that merges the equal tiles on top of each other as the original
+# loop of the game did (column by column, a tile absorbs the equal tile above
+# it and the tiles above are moved down by one cell), returns the score
+def reference_merge(values):
+   grid_h, grid_w = values.shape
+   score = 0
+   for col in range(grid_w):
+      row = 0
+      while row < grid_h - 1:
+         current, above = values[row, col], values[row + 1, col]
+         if current and above and current == above:
+            values[row, col] += 1
+            score += 1 << int(values[row, col])
+            values[row + 1:grid_h - 1, col] = values[row + 2:, col]
+            values[grid_h - 1, col] = 0
+            continue
+         row += 1
+   return score
+
+
+# A function that clears the full rows as the original loop of the game did
+# (row by row from the bottom, the rows above a full row are moved down by one
+# row), returns the score
+def reference_clear(values):
+   grid_h = len(values)
+   score, row = 0, 0
+   while row < grid_h:
+      if np.all(values[row] != 0):
+         score += int(np.sum(np.left_shift(1, values[row].astype(np.int64))))
+         values[row:grid_h - 1] = values[row + 1:].copy()
+         values[grid_h - 1] = 0
+         continue
+      row += 1
+   return score
+
+
+# A function that returns random log2 values of the tiles of a grid where
+# some rows are full (the other rows have an empty cell)
+def values_with_full_rows(rng, grid_h, grid_w):
+   values = random_values(rng, grid_h, grid_w, empty=0)
+   rows = np.flatnonzero(rng.random(grid_h) < 0.6)
+   values[rows, rng.integers(0, grid_w, len(rows))] = 0
+   values[rng.integers(0, grid_h):] = 0
+   return values
+
+
+# A test for checking the merge kernel against the original loop on random
+# grids, one at a time and as a batch (with the columns merged as arrays and
+# one by one, see grid_ops.small_merge_cells)
+def test_merge_columns_matches_reference(monkeypatch):
+   rng = np.random.default_rng(0)
+   for small_merge_cells in (0, 10 ** 9):
+      monkeypatch.setattr(grid_ops, "small_merge_cells", small_merge_cells)
+      for grid_h, grid_w in ((1, 1), (2, 3), (20, 12), (40, 70)):
+         grids = np.stack([random_values(rng, grid_h, grid_w)
+                           for _ in range(20)])
+         expected = grids.copy()
+         expected_scores = [reference_merge(grid) for grid in expected]
+         for grid, expected_grid, expected_score in zip(
+               grids.copy(), expected, expected_scores):
+            assert merge_columns(grid)[0] == expected_score
+            assert np.array_equal(grid, expected_grid)
+         batch = grids.copy()
+         assert merge_columns(batch)[0].tolist() == expected_scores
+         assert np.array_equal(batch, expected)
+
+
+# A test for checking that both ways of merging the columns return the same
+# sources
+def test_merge_columns_sources_match(monkeypatch):
+   rng = np.random.default_rng(8)
+   grids = np.stack([random_values(rng, 20, 12) for _ in range(20)])
+   results = []
+   for small_merge_cells in (0, 10 ** 9):
+      monkeypatch.setattr(grid_ops, "small_merge_cells", small_merge_cells)
+      results.append(merge_columns(grids.copy(), return_sources=True)[1])
+   assert np.array_equal(results[0], results[1])
+
+
+# A test for checking that the sources returned by the merge kernel give the
+# row of each tile before the merges
+def test_merge_columns_sources():
+   rng = np.random.default_rng(1)
+   values = random_values(rng, 20, 12)
+   merged = values.copy()
+   _, sources = merge_columns(merged, return_sources=True)
+   assert not np.any(merged[sources == -1])
+   # a tile is moved down (or stays) and it is not smaller than its source
+   rows, cols = np.nonzero(merged)
+   assert np.all(sources[rows, cols] != -1)
+   assert np.all(sources[rows, cols] >= rows)
+   assert np.all(merged[rows, cols] >= values[sources[rows, cols], cols])
+
+
+# A test for checking that the merges of both board classes match the original
+# loop (the scores, the tiles and the tile counts)
+def test_board_merges_match_reference():
+   rng = np.random.default_rng(2)
+   for _ in range(20):
+      values = random_values(rng, 20, 12)
+      expected = values.copy()
+      expected_score = reference_merge(expected)
+      for board_class in (Board, ArrayBoard):
+         board = board_with(board_class, values)
+         board.merge_tiles()
+         assert board.score == expected_score
+         assert np.array_equal(board.get_values(), expected)
+         counts = np.bincount(expected.ravel(), minlength=Board.n_exponents)
+         assert board.tile_counts[1:].tolist() == counts[1:].tolist()
+
+
+# A test for checking the clear kernel against the original loop on random
+# grids, one at a time and as a batch
+def test_clear_full_rows_matches_reference():
+   rng = np.random.default_rng(3)
+   for grid_h, grid_w in ((1, 1), (3, 2), (20, 12), (40, 70)):
+      grids = np.stack([values_with_full_rows(rng, grid_h, grid_w)
+                        for _ in range(20)])
+      expected = grids.copy()
+      expected_scores = [reference_clear(grid) for grid in expected]
+      for grid, expected_grid, expected_score in zip(grids.copy(), expected,
+                                                     expected_scores):
+         assert clear_full_rows(grid)[0] == expected_score
+         assert np.array_equal(grid, expected_grid)
+      batch = grids.copy()
+      assert clear_full_rows(batch)[0].tolist() == expected_scores
+      assert np.array_equal(batch, expected)
+
+
+# A test for checking that the clears of both board classes match the original
+# loop (the scores, the tiles, the cleared rows and the column heights), with
+# and without full rows
+def test_board_clears_match_reference():
+   rng = np.random.default_rng(4)
+   for _ in range(30):
+      values = values_with_full_rows(rng, 20, 12)
+      expected = values.copy()
+      expected_score = reference_clear(expected)
+      n_cleared = int(np.count_nonzero(np.all(values != 0, axis=1)))
+      for board_class in (Board, ArrayBoard):
+         board = board_with(board_class, values)
+         board.clear_full_rows()
+         assert board.score == expected_score
+         assert board.lines_cleared == n_cleared
+         assert np.array_equal(board.get_values(), expected)
+         assert np.array_equal(board.column_heights,
+                               column_heights(expected != 0))
+
+
+# A function that returns the occupied cells connected to the bottom row as
+# the original breadth-first search of the game found them
+def reference_connected(occupied):
+   grid_h, grid_w = occupied.shape
+   connected = np.zeros((grid_h, grid_w), dtype=bool)
+   for col in range(grid_w):
+      if occupied[0, col] and not connected[0, col]:
+         queue = deque([(0, col)])
+         connected[0, col] = True
+         while queue:
+            r, c = queue.popleft()
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+               if 0 <= nr < grid_h and 0 <= nc < grid_w and \
+                  occupied[nr, nc] and not connected[nr, nc]:
+                  connected[nr, nc] = True
+                  queue.append((nr, nc))
+   return connected
+
+
+# A function that removes the free tiles from the given log2 values as the
+# original loop of the game did, returns the score
+def reference_remove_free(values):
+   free = (values != 0) & ~reference_connected(values != 0)
+   score = int(np.sum(np.left_shift(1, values[free].astype(np.int64))))
+   values[free] = 0
+   return score
+
+
+# A test for checking the flood fill of the connected cells against the
+# original search on random grids (near the density where the tiles start to
+# form large connected regions), one at a time and as a batch, including the
+# grids that are too wide for 64-bit row masks
+def test_connected_cells_matches_reference():
+   rng = np.random.default_rng(5)
+   for grid_h, grid_w in ((1, 1), (5, 4), (20, 12), (30, 70)):
+      grids = rng.random((20, grid_h, grid_w)) < 0.6
+      expected = np.stack([reference_connected(grid) for grid in grids])
+      for grid, expected_grid in zip(grids, expected):
+         assert np.array_equal(connected_cells(grid), expected_grid)
+      assert np.array_equal(connected_cells(grids), expected)
+
+
+# A test for checking that the free tiles removed by both board classes are
+# the ones the original search found (the scores and the tiles)
+def test_board_free_tiles_match_reference():
+   rng = np.random.default_rng(6)
+   for _ in range(20):
+      values = random_values(rng, 20, 12, empty=0.4)
+      expected = values.copy()
+      expected_score = reference_remove_free(expected)
+      for board_class in (Board, ArrayBoard):
+         board = board_with(board_class, values)
+         board.remove_free_tiles()
+         assert board.score == expected_score
+         assert np.array_equal(board.get_values(), expected)
+
+
+# A test for checking the whole lock of both board classes (where the search of
+# the free tiles is skipped when the locked tiles are connected and no tiles
+# are merged or cleared, see Board.are_connected) against the original rules
+# applied in order on random boards with random dropped tetrominoes
+def test_board_locks_match_reference():
+   rng = np.random.default_rng(7)
+   piece_rng = random.Random(7)
+   for _ in range(100):
+      values = random_values(rng, 20, 12, empty=0.5, max_exponent=8)
+      values[rng.integers(4, 16):] = 0  # the rows of the tetromino are empty
+      # a board as it is after a lock (nothing is left to merge or clear)
+      while reference_merge(values) or reference_clear(values):
+         pass
+      reference_remove_free(values)
+      tetromino = Tetromino(piece_rng.choice("IOZSTLJ"), 20, 12, piece_rng)
+      tetromino.rotation = piece_rng.randrange(4)
+      tetromino.bottom_left_cell.y = 15
+      tetromino.hard_drop(board_with(Board, values))
+      piece = tetromino.snapshot()
+      if piece_rng.random() < 0.5:
+         # numbers that are not on the board, so no tiles are merged
+         numbers = tuple(1 << exponent
+                         for exponent in piece_rng.sample(range(9, 13), 4))
+         piece = piece[:4] + (numbers,)
+         tetromino = Tetromino.from_snapshot(piece)
+
+      expected = values.copy()
+      x, y = tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y
+      for (dx, dy), tile in zip(tetromino.current_rotation.offsets,
+                                tetromino.tiles):
+         expected[y + dy, x + dx] = tile.number.bit_length() - 1
+      expected_score = reference_merge(expected)
+      expected_score += reference_clear(expected)
+      expected_score += reference_remove_free(expected)
+      for board_class in (Board, ArrayBoard):
+         board = board_with(board_class, values)
+         tiles, position = Tetromino.from_snapshot(
+            piece).get_min_bounded_tile_matrix(True)
+         board.update_grid(tiles, position)
+         assert board.score == expected_score
+         assert np.array_equal(board.get_values(), expected)
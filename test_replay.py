@@ -0,0 +1,67 @@
+from replay import ReplayLog, RecordingEngine, replay, verify  # under test
+from board import Board  # the default board of the recorded games
+from array_board import ArrayBoard  # the default board of the replays
+from self_play import make_policy  # the random actions of the games
+import numpy as np  # the fundamental Python module for scientific computing
+import random  # used for the seeded random number generators
+import struct  # used for writing a log in the old format
+
+
+# A function that plays a game with random actions on a RecordingEngine (with
+# the given distribution of the pieces) and returns its finished log
+def record_game(seed, piece_queue=None, max_pieces=100):
+   engine = RecordingEngine(20, 12, Board, seed=seed, piece_queue=piece_queue)
+   policy = make_policy("random", random.Random(seed))
+   # a run of actions longer than a byte can hold
+   for _ in range(ReplayLog.max_run + 8):
+      engine.step("down")
+   while not engine.done and engine.pieces_placed < max_pieces:
+      for action in policy(engine):
+         engine.step(action)
+      engine.step("tick")
+   return engine.finish_log()
+
+
+# A test for checking that a log is the same after converting it to bytes and
+# back (and after saving and loading it)
+def test_log_round_trip(tmp_path):
+   for piece_queue in (None, "uniform", "bag"):
+      log = record_game(3, piece_queue)
+      log.save(tmp_path / "game.t2r")
+      for loaded in (ReplayLog.from_bytes(log.tobytes()),
+                     ReplayLog.load(tmp_path / "game.t2r")):
+         assert (loaded.seed, loaded.grid_height, loaded.grid_width,
+                 loaded.piece_queue, loaded.score) == \
+            (log.seed, log.grid_height, log.grid_width, log.piece_queue,
+             log.score)
+         assert loaded.actions == log.actions
+         assert np.array_equal(loaded.values, log.values)
+
+
+# A test for checking that the replays of the logs (on both board classes)
+# end with the recorded score and tiles, and that verify finds the logs that
+# do not match their games
+def test_verify_replays():
+   for piece_queue in (None, "uniform", "bag"):
+      log = ReplayLog.from_bytes(record_game(4, piece_queue).tobytes())
+      assert verify(log, Board) and verify(log, ArrayBoard)
+      assert replay(log).pieces_placed > 0
+      log.score += 2
+      assert not verify(log)
+      log.score -= 2
+      log.values[0, 0] += 1
+      assert not verify(log)
+
+
+# A test for checking that the logs written in the version 1 format (without
+# the distribution of the pieces) can still be loaded and replayed
+def test_version_1_log():
+   data = record_game(5).tobytes()
+   header_size = struct.calcsize(ReplayLog.header_formats[2])
+   _, _, grid_h, grid_w, seed, n_runs, _ = struct.unpack_from(
+      ReplayLog.header_formats[2], data)
+   old_data = struct.pack(ReplayLog.header_formats[1], ReplayLog.magic, 1,
+                          grid_h, grid_w, seed, n_runs) + data[header_size:]
+   log = ReplayLog.from_bytes(old_data)
+   assert log.piece_queue is None
+   assert verify(log)
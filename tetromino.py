@@ -1,232 +1,332 @@
-from tile import Tile  # used for modeling each tile on the tetrominoes
-from point import Point  # used for tile positions
-import copy as cp  # the copy module is used for copying tiles and positions
-import random  # the random module is used for generating random values
-import numpy as np  # the fundamental Python module for scientific computing
-
-# A class for modeling tetrominoes with 3 out of 7 different types as I, O and Z
-class Tetromino:
-   # the dimensions of the game grid (defined as class variables)
-   grid_height, grid_width = None, None
-
-   # A constructor for creating a tetromino with a given shape (type)
-   def __init__(self, shape):
-    self.type = shape
-    occupied_cells = []
-
-    if self.type == 'I':
-        n = 4
-        occupied_cells = [(1, 0), (1, 1), (1, 2), (1, 3)]
-    elif self.type == 'O':
-        n = 2
-        occupied_cells = [(0, 0), (1, 0), (0, 1), (1, 1)]
-    elif self.type == 'Z':
-        n = 3
-        occupied_cells = [(0, 1), (1, 1), (1, 2), (2, 2)]
-    elif self.type == 'S':
-        n = 3
-        occupied_cells = [(1, 1), (2, 1), (0, 2), (1, 2)]
-    elif self.type == 'T':
-        n = 3
-        occupied_cells = [(0, 1), (1, 1), (2, 1), (1, 2)]
-    elif self.type == 'L':
-        n = 3
-        occupied_cells = [(0, 0), (0, 1), (0, 2), (1, 2)]
-    elif self.type == 'J':
-        n = 3
-        occupied_cells = [(1, 0), (1, 1), (1, 2), (0, 2)]
-    else:
-        raise ValueError(f"Unsupported tetromino type: {self.type}")
-
-    self.tile_matrix = np.full((n, n), None)
-    for col_index, row_index in occupied_cells:
-        self.tile_matrix[row_index][col_index] = Tile()
-
-    self.bottom_left_cell = Point()
-    self.bottom_left_cell.y = Tetromino.grid_height - 1
-    self.bottom_left_cell.x = random.randint(0, Tetromino.grid_width - n)
-
-   # A method that computes and returns the position of the cell in the tile
-   # matrix specified by the given row and column indexes
-   def get_cell_position(self, row, col):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      position = Point()
-      # horizontal position of the cell
-      position.x = self.bottom_left_cell.x + col
-      # vertical position of the cell
-      position.y = self.bottom_left_cell.y + (n - 1) - row
-      return position
-
-   # A method to return a copy of the tile matrix without any empty row/column,
-   # and the position of the bottom left cell when return_position is set
-   def get_min_bounded_tile_matrix(self, return_position=False):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      # determine rows and columns to copy (omit empty rows and columns)
-      min_row, max_row, min_col, max_col = n - 1, 0, n - 1, 0
-      for row in range(n):
-         for col in range(n):
-            if self.tile_matrix[row][col] is not None:
-               if row < min_row:
-                  min_row = row
-               if row > max_row:
-                  max_row = row
-               if col < min_col:
-                  min_col = col
-               if col > max_col:
-                  max_col = col
-      # copy the tiles from the tile matrix of this tetromino
-      copy = np.full((max_row - min_row + 1, max_col - min_col + 1), None)
-      for row in range(min_row, max_row + 1):
-         for col in range(min_col, max_col + 1):
-            if self.tile_matrix[row][col] is not None:
-               row_ind = row - min_row
-               col_ind = col - min_col
-               copy[row_ind][col_ind] = cp.deepcopy(self.tile_matrix[row][col])
-      # return just the matrix copy when return_position is not set (as True)
-      # the argument return_position defaults to False when a value is not given
-      if not return_position:
-         return copy
-      # otherwise return the position of the bottom left cell in copy as well
-      else:
-         blc_position = cp.copy(self.bottom_left_cell)
-         blc_position.translate(min_col, (n - 1) - max_row)
-         return copy, blc_position
-
-   # A method for drawing the tetromino on the game grid
-   def draw(self, ghost=False):
-    n = len(self.tile_matrix)
-    for row in range(n):
-        for col in range(n):
-            if self.tile_matrix[row][col] is not None:
-                pos = self.get_cell_position(row, col)
-                if pos.y < Tetromino.grid_height:
-                    self.tile_matrix[row][col].draw(pos, ghost=ghost)  # 👈 ghost parametresini forward et
-
-   
-   def rotate(self, game_grid):
-    if self.type == 'O':  # O şekli dönmez
-        return
-
-    n = len(self.tile_matrix)
-    rotated = np.full((n, n), None)
-    for i in range(n):
-        for j in range(n):
-            rotated[j][n - 1 - i] = self.tile_matrix[i][j]
-
-    # Orijinal konumu kaydet
-    original_x = self.bottom_left_cell.x
-
-    # Wall kick denemeleri: 0 (orijinal), -1 (sol), +1 (sağ)
-    for dx in [0, -1, 1]:
-        can_rotate = True
-        for row in range(n):
-            for col in range(n):
-                if rotated[row][col] is not None:
-                    pos = self.get_cell_position(row, col)
-                    pos.x += dx  # X konumunu kaydır
-                    if not game_grid.is_inside(pos.y, pos.x) or game_grid.is_occupied(pos.y, pos.x):
-                        can_rotate = False
-                        break
-            if not can_rotate:
-                break
-
-        if can_rotate:
-            # Döndürme başarılı, uygula
-            self.tile_matrix = rotated
-            self.bottom_left_cell.x += dx
-            return  # Başarılı döndürme
-
-   
-   def can_be_rotated(self, game_grid):
-    # O şekli döndürmeyelim (simetrik)
-    if self.type == 'O':
-        return False
-
-    n = len(self.tile_matrix)
-    rotated = np.full((n, n), None)
-    for i in range(n):
-        for j in range(n):
-            rotated[j][n - 1 - i] = self.tile_matrix[i][j]
-
-    for row in range(n):
-        for col in range(n):
-            if rotated[row][col] is not None:
-                pos = self.get_cell_position(row, col)
-                # Eğer sınır dışıysa veya doluysa döndürülemez
-                if not game_grid.is_inside(pos.y, pos.x) or game_grid.is_occupied(pos.y, pos.x):
-                    return False
-    return True
-   # A method for moving this tetromino in a given direction by 1 on the grid
-   def move(self, direction, game_grid):
-      # check if this tetromino can be moved in the given direction by using
-      # the can_be_moved method defined below
-      if not (self.can_be_moved(direction, game_grid)):
-         return False  # the tetromino cannot be moved in the given direction
-      # move this tetromino by updating the position of its bottom left cell
-      if direction == "left":
-         self.bottom_left_cell.x -= 1
-      elif direction == "right":
-         self.bottom_left_cell.x += 1
-      else:  # direction == "down"
-         self.bottom_left_cell.y -= 1
-      return True  # a successful move in the given direction
-
-   # A method for checking if this tetromino can be moved in a given direction
-   def can_be_moved(self, direction, game_grid):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      # check for moving left or right
-      if direction == "left" or direction == "right":
-         for row_index in range(n):
-            for col_index in range(n):
-               # direction = left --> check the leftmost tile of each row
-               row, col = row_index, col_index
-               if direction == "left" and self.tile_matrix[row][col] is not None:
-                  # the position of the leftmost tile of the current row
-                  leftmost = self.get_cell_position(row, col)
-                  # if any leftmost tile is at x = 0
-                  if leftmost.x == 0:
-                     return False  # this tetromino cannot be moved left
-                  # if the grid cell on the left of a leftmost tile is occupied
-                  if game_grid.is_occupied(leftmost.y, leftmost.x - 1):
-                     return False  # this tetromino cannot be moved left
-                  # as the leftmost tile of the current row is checked
-                  break  # end the inner for loop
-               # direction = right --> check the rightmost tile of each row
-               row, col = row_index, n - 1 - col_index
-               if direction == "right" and self.tile_matrix[row][col] is not None:
-                  # the position of the rightmost tile of the current row
-                  rightmost = self.get_cell_position(row, col)
-                  # if any rightmost tile is at x = grid_width - 1
-                  if rightmost.x == Tetromino.grid_width - 1:
-                     return False  # this tetromino cannot be moved right
-                  # if the grid cell on the right of a rightmost tile is occupied
-                  if game_grid.is_occupied(rightmost.y, rightmost.x + 1):
-                     return False  # this tetromino cannot be moved right
-                  # as the rightmost tile of the current row is checked
-                  break  # end the inner for loop
-      # direction = down --> check the bottommost tile of each column
-      else:
-         for col in range(n):
-            for row in range(n - 1, -1, -1):
-               # if the current cell of the tetromino is occupied by a tile
-               if self.tile_matrix[row][col] is not None:
-                  # the position of the bottommost tile of the current col
-                  bottommost = self.get_cell_position(row, col)
-                  # if any bottommost tile is at y = 0
-                  if bottommost.y == 0:
-                     return False  # this tetromino cannot be moved down
-                  # if the grid cell below any bottommost tile is occupied
-                  if game_grid.is_occupied(bottommost.y - 1, bottommost.x):
-                     return False  # this tetromino cannot be moved down
-                  # as the bottommost tile of the current row is checked
-                  break  # end the inner for loop
-      # if this method does not end by returning False before this line
-      return True  # this tetromino can be moved in the given direction
-   def get_ghost_copy(self, game_grid):
-      import copy
-      ghost = copy.deepcopy(self)
-
-      while ghost.can_be_moved("down", game_grid):
-         ghost.bottom_left_cell.y -= 1
-      
-      return ghost
\ No newline at end of file
+from tile import Tile  # used for modeling each tile on the tetrominoes
+from point import Point  # used for tile positions
+import copy as cp  # the copy module is used for copying positions
+import random  # the random module is used for generating random values
+import numpy as np  # the fundamental Python module for scientific computing
+
+# A class for modeling tetrominoes with 7 different types as I, O, Z, S, T, L
+# and J (the cells of each type in all 4 rotations are computed once, see the
+# Rotation class below, so rotating a tetromino only changes its rotation index)
+class Tetromino:
+   # the size n of the n x n tile matrix and the occupied cells as (col, row)
+   # indexes in the tile matrix for each type of tetromino
+   shapes = {
+      'I': (4, [(1, 0), (1, 1), (1, 2), (1, 3)]),
+      'O': (2, [(0, 0), (1, 0), (0, 1), (1, 1)]),
+      'Z': (3, [(0, 1), (1, 1), (1, 2), (2, 2)]),
+      'S': (3, [(1, 1), (2, 1), (0, 2), (1, 2)]),
+      'T': (3, [(0, 1), (1, 1), (2, 1), (1, 2)]),
+      'L': (3, [(0, 0), (0, 1), (0, 2), (1, 2)]),
+      'J': (3, [(1, 0), (1, 1), (1, 2), (0, 2)]),
+   }
+   # the horizontal shifts tried in order when a tetromino is rotated (wall
+   # kicks: 0 (orijinal), -1 (sol), +1 (sağ)), O şekli dönmez
+   wall_kicks = {shape: (0, -1, 1) for shape in shapes}
+   wall_kicks['O'] = ()
+   # the 4 rotations of each type of tetromino (computed once below the class)
+   rotations = None
+
+   # A constructor for creating a tetromino with a given shape (type) at the
+   # top of a grid with given dimensions, the numbers on its tiles and its
+   # column are drawn from the given random number generator (the random
+   # module by default)
+   def __init__(self, shape, grid_h, grid_w, rng=random):
+      if shape not in Tetromino.shapes:
+         raise ValueError(f"Unsupported tetromino type: {shape}")
+      self.type = shape
+      self.rotation = 0  # the index of the current rotation (0-3)
+      n, occupied_cells = Tetromino.shapes[shape]
+      # the tiles of this tetromino in the order of its cells (the same tile
+      # is in the i-th cell of each rotation)
+      self.tiles = [Tile(rng) for _ in occupied_cells]
+
+      self.bottom_left_cell = Point()
+      self.bottom_left_cell.y = grid_h - 1
+      self.bottom_left_cell.x = rng.randint(0, grid_w - n)
+
+   # The precomputed cells of the current rotation of this tetromino
+   @property
+   def current_rotation(self):
+      return Tetromino.rotations[self.type][self.rotation]
+
+   # The n x n tile matrix of this tetromino in its current rotation
+   @property
+   def tile_matrix(self):
+      rotation = self.current_rotation
+      tile_matrix = np.full((rotation.n, rotation.n), None)
+      for (row, col), tile in zip(rotation.cells, self.tiles):
+         tile_matrix[row][col] = tile
+      return tile_matrix
+
+   # A method that computes and returns the position of the cell in the tile
+   # matrix specified by the given row and column indexes
+   def get_cell_position(self, row, col):
+      n = self.current_rotation.n  # n = number of rows = number of columns
+      position = Point()
+      # horizontal position of the cell
+      position.x = self.bottom_left_cell.x + col
+      # vertical position of the cell
+      position.y = self.bottom_left_cell.y + (n - 1) - row
+      return position
+
+   # A method to return a copy of the tile matrix without any empty row/column,
+   # and the position of the bottom left cell when return_position is set
+   # (the tiles are not copied, they are moved to the game grid when the
+   # tetromino is locked and the tetromino is not used after that)
+   def get_min_bounded_tile_matrix(self, return_position=False):
+      rotation = self.current_rotation
+      # the rows and columns to copy (omitting empty rows and columns)
+      min_row, max_row, min_col, max_col = rotation.bounds
+      # place the tiles of this tetromino on the copy of the tile matrix
+      copy = np.full((max_row - min_row + 1, max_col - min_col + 1), None)
+      for (row, col), tile in zip(rotation.cells, self.tiles):
+         copy[row - min_row][col - min_col] = tile
+      # return just the matrix copy when return_position is not set (as True)
+      # the argument return_position defaults to False when a value is not given
+      if not return_position:
+         return copy
+      # otherwise return the position of the bottom left cell in copy as well
+      else:
+         blc_position = cp.copy(self.bottom_left_cell)
+         blc_position.translate(min_col, (rotation.n - 1) - max_row)
+         return copy, blc_position
+
+   # A method for drawing the tetromino on a game grid with a given height
+   # (the tiles above the grid are not drawn)
+   def draw(self, grid_h, ghost=False):
+      for (dx, dy), tile in zip(self.current_rotation.offsets, self.tiles):
+         pos = Point(self.bottom_left_cell.x + dx, self.bottom_left_cell.y + dy)
+         if pos.y < grid_h:
+            tile.draw(pos, ghost=ghost)  # 👈 ghost parametresini forward et
+
+   # A method for rotating this tetromino clockwise if the rotated tetromino
+   # fits on the grid at its position or at one of the wall kick positions
+   def rotate(self, game_grid):
+      next_rotation = (self.rotation + 1) % 4
+      offsets = Tetromino.rotations[self.type][next_rotation].offsets
+      for dx in Tetromino.wall_kicks[self.type]:
+         if self.fits(offsets, game_grid, dx):
+            # Döndürme başarılı, uygula
+            self.rotation = next_rotation
+            self.bottom_left_cell.x += dx
+            return  # Başarılı döndürme
+
+   # A method for checking if this tetromino can be rotated without any wall
+   # kicks (O şekli döndürmeyelim, simetrik)
+   def can_be_rotated(self, game_grid):
+      if not Tetromino.wall_kicks[self.type]:
+         return False
+      next_rotation = (self.rotation + 1) % 4
+      offsets = Tetromino.rotations[self.type][next_rotation].offsets
+      return self.fits(offsets, game_grid)
+
+   # A method for checking if the cells with the given offsets from the bottom
+   # left cell (shifted by dx) are all inside the grid and not occupied
+   def fits(self, offsets, game_grid, dx=0):
+      x, y = self.bottom_left_cell.x + dx, self.bottom_left_cell.y
+      for cell_dx, cell_dy in offsets:
+         # Eğer sınır dışıysa veya doluysa sığmaz
+         if not game_grid.is_inside(y + cell_dy, x + cell_dx) or \
+            game_grid.is_occupied(y + cell_dy, x + cell_dx):
+            return False
+      return True
+
+   # A method for moving this tetromino in a given direction by 1 on the grid
+   def move(self, direction, game_grid):
+      # check if this tetromino can be moved in the given direction by using
+      # the can_be_moved method defined below
+      if not (self.can_be_moved(direction, game_grid)):
+         return False  # the tetromino cannot be moved in the given direction
+      # move this tetromino by updating the position of its bottom left cell
+      if direction == "left":
+         self.bottom_left_cell.x -= 1
+      elif direction == "right":
+         self.bottom_left_cell.x += 1
+      else:  # direction == "down"
+         self.bottom_left_cell.y -= 1
+      return True  # a successful move in the given direction
+
+   # A method for checking if this tetromino can be moved in a given direction
+   # (only the leftmost tile of each row, the rightmost tile of each row or the
+   # bottommost tile of each column can be blocked, which are precomputed)
+   def can_be_moved(self, direction, game_grid):
+      rotation = self.current_rotation
+      x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      if direction == "left":
+         edge, dx, dy = rotation.left_edge, -1, 0
+         if x + rotation.min_dx == 0:
+            return False  # the leftmost tile is at x = 0
+      elif direction == "right":
+         edge, dx, dy = rotation.right_edge, 1, 0
+         if x + rotation.max_dx == game_grid.grid_width - 1:
+            return False  # the rightmost tile is at x = grid_width - 1
+      else:  # direction == "down"
+         edge, dx, dy = rotation.bottom_edge, 0, -1
+         if y + rotation.min_dy == 0:
+            return False  # the bottommost tile is at y = 0
+      # if the grid cell next to any tile on the edge is occupied
+      for cell_dx, cell_dy in edge:
+         if game_grid.is_occupied(y + cell_dy + dy, x + cell_dx + dx):
+            return False  # this tetromino cannot be moved
+      # if this method does not end by returning False before this line
+      return True  # this tetromino can be moved in the given direction
+
+   # A method that returns the leftmost and the rightmost columns that this
+   # tetromino can reach by moving left or right in its row (all the columns
+   # where it fits are found in one call, see Board.fitting_columns)
+   def get_reachable_columns(self, game_grid):
+      x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      columns = game_grid.fitting_columns(self.current_rotation.offsets,
+                                          y).tolist()
+      if x not in columns:
+         # the tetromino overlaps the tiles on the grid (e.g. when a held
+         # tetromino is swapped in), so it is moved column by column
+         return self.get_step_reachable_columns(game_grid)
+      left = right = columns.index(x)
+      while left > 0 and columns[left - 1] == columns[left] - 1:
+         left -= 1
+      while right < len(columns) - 1 and \
+         columns[right + 1] == columns[right] + 1:
+         right += 1
+      return columns[left], columns[right]
+
+   # A method that returns the leftmost and the rightmost columns that this
+   # tetromino can reach by moving it column by column (and then moving it
+   # back)
+   def get_step_reachable_columns(self, game_grid):
+      x = self.bottom_left_cell.x
+      while self.can_be_moved("left", game_grid):
+         self.bottom_left_cell.x -= 1
+      left = self.bottom_left_cell.x
+      self.bottom_left_cell.x = x
+      while self.can_be_moved("right", game_grid):
+         self.bottom_left_cell.x += 1
+      right = self.bottom_left_cell.x
+      self.bottom_left_cell.x = x
+      return left, right
+
+   # A method that returns the number of rows this tetromino can move down,
+   # found from the bottommost cell of each of its columns and the heights of
+   # the columns on the grid (instead of moving it down row by row)
+   def get_drop_distance(self, game_grid):
+      x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      distance = None
+      for dx, dy in self.current_rotation.bottom_edge:
+         gap = y + dy - game_grid.column_heights[x + dx]
+         if gap < 0:
+            # the tetromino is below the highest tile of a column (e.g. it is
+            # moved under an overhang), so it is moved down row by row
+            return self.get_step_drop_distance(game_grid)
+         if distance is None or gap < distance:
+            distance = gap
+      return int(distance)
+
+   # A method that returns the number of rows this tetromino can move down by
+   # moving it down row by row (and then moving it back)
+   def get_step_drop_distance(self, game_grid):
+      y = self.bottom_left_cell.y
+      while self.can_be_moved("down", game_grid):
+         self.bottom_left_cell.y -= 1
+      distance = y - self.bottom_left_cell.y
+      self.bottom_left_cell.y = y
+      return distance
+
+   # A method for moving this tetromino down as far as possible (hard drop),
+   # returns True if the tetromino is moved
+   def hard_drop(self, game_grid):
+      distance = self.get_drop_distance(game_grid)
+      self.bottom_left_cell.y -= distance
+      return distance > 0
+
+   # A method that returns the ghost of this tetromino, i.e. a copy of it at
+   # the position where it would land (the copy shares the tiles of this
+   # tetromino, only its position is different)
+   def get_ghost_copy(self, game_grid):
+      ghost = cp.copy(self)
+      ghost.bottom_left_cell = Point(self.bottom_left_cell.x,
+                                     self.bottom_left_cell.y -
+                                     self.get_drop_distance(game_grid))
+      return ghost
+
+   # A method that returns the state of this tetromino (its type, rotation,
+   # position and the numbers on its tiles) as a hashable tuple
+   def snapshot(self):
+      return (self.type, self.rotation, self.bottom_left_cell.x,
+              self.bottom_left_cell.y, tuple(tile.number for tile in self.tiles))
+
+   # A method for restoring the state of this tetromino from a snapshot (with
+   # new tiles, so the tiles locked on a grid are not changed)
+   def restore(self, snapshot):
+      self.type, self.rotation, x, y, numbers = snapshot
+      self.bottom_left_cell = Point(x, y)
+      self.tiles = [Tile.with_number(number) for number in numbers]
+
+   # A method for creating a tetromino from a snapshot (without drawing any
+   # random values)
+   @classmethod
+   def from_snapshot(cls, snapshot):
+      tetromino = cls.__new__(cls)
+      tetromino.restore(snapshot)
+      return tetromino
+
+
+# A class for modeling a rotation of a type of tetromino with the cells that
+# are precomputed for checking collisions and drawing
+class Rotation:
+   # A constructor for creating a rotation from the occupied (row, col) cells
+   # of an n x n tile matrix
+   def __init__(self, n, cells):
+      self.n = n
+      self.cells = tuple(cells)
+      # the offsets (dx, dy) of the cells from the bottom left cell
+      self.offsets = tuple((col, (n - 1) - row) for row, col in self.cells)
+      rows = [row for row, _ in self.cells]
+      cols = [col for _, col in self.cells]
+      self.bounds = (min(rows), max(rows), min(cols), max(cols))
+      self.min_dx, self.max_dx = min(cols), max(cols)
+      self.min_dy = (n - 1) - max(rows)
+      # the offsets of the leftmost and the rightmost cell of each row
+      left_edge, right_edge = [], []
+      for y in sorted({dy for _, dy in self.offsets}):
+         row_offsets = [(dx, dy) for dx, dy in self.offsets if dy == y]
+         left_edge.append(min(row_offsets))
+         right_edge.append(max(row_offsets))
+      # the offsets of the bottommost cell of each column
+      bottom_edge = []
+      for x in sorted({dx for dx, _ in self.offsets}):
+         col_offsets = [(dx, dy) for dx, dy in self.offsets if dx == x]
+         bottom_edge.append(min(col_offsets, key=lambda offset: offset[1]))
+      self.left_edge = tuple(left_edge)
+      self.right_edge = tuple(right_edge)
+      self.bottom_edge = tuple(bottom_edge)
+
+   # A method that returns the next rotation (rotated clockwise)
+   def rotated(self):
+      n = self.n
+      return Rotation(n, [(col, n - 1 - row) for row, col in self.cells])
+
+
+# A function that computes the 4 rotations of each type of tetromino with the
+# given shapes (see Tetromino.shapes)
+def compute_rotations(shapes):
+   rotations = {}
+   for shape, (n, occupied_cells) in shapes.items():
+      rotation = Rotation(n, [(row, col) for col, row in occupied_cells])
+      rotations[shape] = [rotation]
+      for _ in range(3):
+         rotation = rotation.rotated()
+         rotations[shape].append(rotation)
+      rotations[shape] = tuple(rotations[shape])
+   return rotations
+
+
+Tetromino.rotations = compute_rotations(Tetromino.shapes)
+
+
+# A function for creating a tetromino with a randomly selected type at the top
+# of a grid with given dimensions (using the given random number generator,
+# the random module by default)
+def create_tetromino(grid_h, grid_w, rng=random):
+   tetromino_types = ['I', 'O', 'Z', 'T', 'S', 'L', 'J']
+   random_type = rng.choice(tetromino_types)
+   return Tetromino(random_type, grid_h, grid_w, rng)
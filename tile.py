@@ -1,40 +1,109 @@
-import lib.stddraw as stddraw  # used for drawing the tiles to display them
-from lib.color import Color  # used for coloring the tiles
-import random  # for assigning random numbers to tiles
-
-# A class for modeling numbered tiles as in 2048
-class Tile:
-   # Class variables shared among all Tile objects
-   boundary_thickness = 0.004
-   font_family, font_size = "Arial", 14
-
-   # A constructor that creates a tile with 2 or 4 as the number on it
-   def __init__(self):
-      # set the number on this tile (90% 2, 10% 4)
-      self.number = 4 if random.random() < 0.1 else 2
-      # set the colors of this tile
-      self.background_color = Color(151, 178, 199)
-      self.foreground_color = Color(0, 100, 200)
-      self.box_color = Color(0, 100, 200)
-
-   # A method for drawing this tile at a given position with a given length
-   def draw(self, position, length=1, ghost=False):
-    if ghost:
-        ghost_color = Color(200, 200, 200)  # gri
-        stddraw.setPenColor(ghost_color)
-        stddraw.filledSquare(position.x, position.y, length / 2)
-        stddraw.setPenColor(Color(150, 150, 150))  # kenarlık
-        stddraw.setPenRadius(Tile.boundary_thickness)
-        stddraw.square(position.x, position.y, length / 2)
-        stddraw.setPenRadius()
-    else:
-        stddraw.setPenColor(self.background_color)
-        stddraw.filledSquare(position.x, position.y, length / 2)
-        stddraw.setPenColor(self.box_color)
-        stddraw.setPenRadius(Tile.boundary_thickness)
-        stddraw.square(position.x, position.y, length / 2)
-        stddraw.setPenRadius()
-        stddraw.setPenColor(self.foreground_color)
-        stddraw.setFontFamily(Tile.font_family)
-        stddraw.setFontSize(Tile.font_size)
-        stddraw.text(position.x, position.y, str(self.number))
\ No newline at end of file
+import random  # for assigning random numbers to tiles
+
+# The drawing stack is imported the first time a tile is drawn (instead of at
+# module load) so that the game rules can run without opening a window
+def _drawing_modules():
+   import lib.stddraw as stddraw  # used for drawing the tiles to display them
+   from lib.color import Color  # used for coloring the tiles
+   return stddraw, Color
+
+# A class for modeling numbered tiles as in 2048
+class Tile:
+   # a tile only stores its number (the colors and the label of each number
+   # are shared by all the tiles through the palette below)
+   __slots__ = ("number",)
+   # Class variables shared among all Tile objects
+   boundary_thickness = 0.004
+   font_family, font_size = "Arial", 14
+
+   # A constructor that creates a tile with 2 or 4 as the number on it (drawn
+   # from the given random number generator, the random module by default)
+   def __init__(self, rng=random):
+      # set the number on this tile (90% 2, 10% 4)
+      self.number = 4 if rng.random() < 0.1 else 2
+
+   # A method for creating a tile with a given number on it
+   @classmethod
+   def with_number(cls, number):
+      tile = cls.__new__(cls)
+      tile.number = number
+      return tile
+
+   # The colors of this tile (shared by all the tiles with the same number)
+   @property
+   def background_color(self):
+      return TileStyle.of(self.number).background_color
+
+   @property
+   def foreground_color(self):
+      return TileStyle.of(self.number).foreground_color
+
+   @property
+   def box_color(self):
+      return TileStyle.of(self.number).box_color
+
+   # A method for drawing this tile at a given position with a given length
+   def draw(self, position, length=1, ghost=False):
+    stddraw = _drawing_modules()[0]
+    style = TileStyle.ghost() if ghost else TileStyle.of(self.number)
+    stddraw.setPenColor(style.background_color)
+    stddraw.filledSquare(position.x, position.y, length / 2)
+    stddraw.setPenColor(style.box_color)
+    stddraw.setPenRadius(Tile.boundary_thickness)
+    stddraw.square(position.x, position.y, length / 2)
+    stddraw.setPenRadius()
+    if style.label is not None:
+        stddraw.setPenColor(style.foreground_color)
+        stddraw.setFontFamily(Tile.font_family)
+        stddraw.setFontSize(Tile.font_size)
+        stddraw.text(position.x, position.y, style.label)
+
+
+# A class for modeling how the tiles with a given number are drawn (the colors
+# and the label), the styles are created once and shared by all the tiles
+class TileStyle:
+   __slots__ = ("background_color", "foreground_color", "box_color", "label")
+   # the styles of the numbers 2, 4, 8, ..., 2048 are created in advance (the
+   # styles of larger numbers are added when they are first needed)
+   precomputed_numbers = [2 ** exponent for exponent in range(1, 12)]
+   palette = None  # the styles keyed by the number on the tiles
+   ghost_style = None  # the style of the ghost tiles
+
+   def __init__(self, background_color, foreground_color, box_color, label):
+      self.background_color = background_color
+      self.foreground_color = foreground_color
+      self.box_color = box_color
+      self.label = label
+
+   # A method that returns the style of the tiles with a given number
+   @staticmethod
+   def of(number):
+      if TileStyle.palette is None:
+         TileStyle.create_palette()
+      style = TileStyle.palette.get(number)
+      if style is None:
+         style = TileStyle.palette[number] = TileStyle.for_number(number)
+      return style
+
+   # A method that returns the style of the ghost tiles (without a label)
+   @staticmethod
+   def ghost():
+      if TileStyle.palette is None:
+         TileStyle.create_palette()
+      return TileStyle.ghost_style
+
+   # A method for creating the style of the tiles with a given number
+   @staticmethod
+   def for_number(number):
+      Color = _drawing_modules()[1]
+      return TileStyle(Color(151, 178, 199), Color(0, 100, 200),
+                       Color(0, 100, 200), str(number))
+
+   # A method for creating the styles of the precomputed numbers and the ghost
+   @staticmethod
+   def create_palette():
+      Color = _drawing_modules()[1]
+      TileStyle.palette = {number: TileStyle.for_number(number)
+                           for number in TileStyle.precomputed_numbers}
+      TileStyle.ghost_style = TileStyle(Color(200, 200, 200), None,
+                                        Color(150, 150, 150), None)  # gri